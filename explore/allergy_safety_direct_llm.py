@@ -13,6 +13,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.llm import call_llm
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
 DATA_DIR = Path(__file__).parent / "data"
 GT_FILE = DATA_DIR / "semantic_gt" / "task_G1a" / "computed_gt.json"
 DATASET_FILE = DATA_DIR / "dataset_K200.jsonl"
@@ -75,14 +82,30 @@ def load_ground_truth():
         return json.load(f)
 
 
-def load_dataset():
-    """Load dataset indexed by restaurant name."""
+def load_dataset(names=None):
+    """
+    Load dataset indexed by restaurant name.
+
+    If names is given, only those restaurants are parsed: lines that do not
+    contain any of the names (JSON-encoded) are skipped unparsed.
+    """
     dataset = {}
-    with open(DATASET_FILE) as f:
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    needles = None
+    if names is not None:
+        names = set(names)
+        needles = {json.dumps(n, ensure_ascii=a).encode() for n in names for a in (True, False)}
+    with open(DATASET_FILE, 'rb') as f:
         for line in f:
-            item = json.loads(line)
+            if needles is not None and not any(needle in line for needle in needles):
+                continue
+            item = loads(line)
             name = item["business"]["name"]
-            dataset[name] = item
+            if names is None or name in names:
+                # Prompt only shows YYYY-MM-DD: slice once here, not per prompt build
+                for rev in item["reviews"]:
+                    rev["date10"] = rev["date"][:10]
+                dataset[name] = item
     return dataset
 
 
@@ -121,11 +144,13 @@ def get_test_restaurants():
 
 def format_reviews(reviews: list, max_reviews: int = 200) -> str:
     """Format reviews for prompt."""
-    parts = []
-    for i, rev in enumerate(reviews[:max_reviews]):
-        text = rev["text"][:500] + "..." if len(rev["text"]) > 500 else rev["text"]
-        parts.append(f"[Review #{i}] Date: {rev['date'][:10]} | Stars: {rev['stars']}\n{text}\n")
-    return "\n".join(parts)
+    # One join over the fragments; truncation is done inside the f-string
+    # so no intermediate "text + '...'" string is built per review
+    return "\n".join(
+        f"[Review #{i}] Date: {rev.get('date10') or rev['date'][:10]} | Stars: {rev['stars']}\n"
+        f"{rev['text'][:500]}{'...' if len(rev['text']) > 500 else ''}\n"
+        for i, rev in enumerate(reviews[:max_reviews])
+    )
 
 
 def evaluate_single_restaurant(name: str, dataset: dict, max_reviews: int = 200) -> dict:
@@ -167,7 +192,7 @@ def run_direct_llm_test(max_reviews: int = 200):
     # Load data
     print("\n1. Loading ground truth and dataset...")
     test_restaurants = get_test_restaurants()
-    dataset = load_dataset()
+    dataset = load_dataset(r["name"] for r in test_restaurants)
 
     print(f"   Test set: {len(test_restaurants)} restaurants")
     print(f"   Reviews per restaurant: {max_reviews}")
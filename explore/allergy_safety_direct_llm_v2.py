@@ -4,20 +4,36 @@ Direct LLM test for Allergy Safety Policy - V2 Agenda Spec.
 Uses the precise agenda spec with clear labeling policy.
 """
 
+import re
 import json
+import asyncio
+import hashlib
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.llm import call_llm
+from utils.llm import call_llm, call_llm_async, get_config, get_configured_model
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
 
 DATA_DIR = Path(__file__).parent / "data"
 GT_FILE = DATA_DIR / "semantic_gt" / "task_G1a" / "computed_gt.json"
 DATASET_FILE = DATA_DIR / "dataset_K200.jsonl"
+LLM_CACHE_FILE = Path(__file__).parent / ".llm_cache.sqlite"
 
-AGENDA_SPEC_PROMPT = """# Agenda Spec — Peanut/Nut Allergy Risk (per restaurant) — v1
+# Static instructions, identical for every restaurant. Kept as a separate
+# leading block so each request shares a byte-identical prompt prefix
+# (provider-side prompt caching) - per-restaurant data only goes after it.
+AGENDA_SPEC = """# Agenda Spec — Peanut/Nut Allergy Risk (per restaurant) — v1
 
 ## Scope
 You are given all reviews for one restaurant. Produce exactly one risk verdict for this restaurant.
@@ -59,20 +75,20 @@ For every evidence item you include, you must extract these fields (or output "u
 Output a single JSON object with this schema:
 
 ```json
-{{
+{
   "verdict": "Low Risk | High Risk | Critical",
   "evidences": [
-    {{
+    {
       "review_id": "string",
       "quote": "string",
-      "extracted_fields": {{
+      "extracted_fields": {
         "severity": "mild | moderate | severe | unknown",
         "firsthand": "true | false | unknown",
         "date": "YYYY-MM-DD | unknown"
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 ```
 
 ## Evidence list rules
@@ -81,7 +97,9 @@ Output a single JSON object with this schema:
 
 ---
 
-# RESTAURANT: {restaurant_name}
+"""
+
+RESTAURANT_SECTION = """# RESTAURANT: {restaurant_name}
 - Categories: {categories}
 
 ## Reviews:
@@ -100,14 +118,30 @@ def load_ground_truth():
         return json.load(f)
 
 
-def load_dataset():
-    """Load dataset indexed by restaurant name."""
+def load_dataset(names=None):
+    """
+    Load dataset indexed by restaurant name.
+
+    If names is given, only those restaurants are parsed: lines that do not
+    contain any of the names (JSON-encoded) are skipped unparsed.
+    """
     dataset = {}
-    with open(DATASET_FILE) as f:
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    needles = None
+    if names is not None:
+        names = set(names)
+        needles = {json.dumps(n, ensure_ascii=a).encode() for n in names for a in (True, False)}
+    with open(DATASET_FILE, 'rb') as f:
         for line in f:
-            item = json.loads(line)
+            if needles is not None and not any(needle in line for needle in needles):
+                continue
+            item = loads(line)
             name = item["business"]["name"]
-            dataset[name] = item
+            if names is None or name in names:
+                # Prompt only shows YYYY-MM-DD: slice once here, not per prompt build
+                for rev in item["reviews"]:
+                    rev["date10"] = rev["date"][:10]
+                dataset[name] = item
     return dataset
 
 
@@ -144,36 +178,84 @@ def get_test_restaurants():
     return test_set
 
 
+def _cache_key(prompt: str) -> str:
+    """Hash of the prompt and every setting that can change the response."""
+    config = get_config()
+    settings = (config["provider"], get_configured_model(), config["base_url"],
+                config["temperature"], config["max_tokens"], config["max_tokens_reasoning"])
+    return hashlib.blake2b(f"{settings!r}\0{prompt}".encode(), digest_size=16).hexdigest()
+
+
+def _cache_connect() -> sqlite3.Connection:
+    db = sqlite3.connect(LLM_CACHE_FILE)
+    db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT)")
+    return db
+
+
+def _cache_lookup(key: str):
+    with closing(_cache_connect()) as db:
+        row = db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def _cache_store(key: str, response: str):
+    with closing(_cache_connect()) as db, db:
+        db.execute("INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response))
+
+
+def cached_call_llm(prompt: str, use_cache: bool = True) -> str:
+    """
+    call_llm with a persistent response cache.
+
+    Responses are stored in LLM_CACHE_FILE keyed by a hash of the prompt and
+    the LLM settings (provider, model, endpoint, sampling), so re-running the
+    test with unchanged prompts and settings skips the API call entirely.
+    """
+    if not use_cache:
+        return call_llm(prompt)
+    key = _cache_key(prompt)
+    response = _cache_lookup(key)
+    if response is None:
+        response = call_llm(prompt)
+        _cache_store(key, response)
+    return response
+
+
+async def cached_call_llm_async(prompt: str, use_cache: bool = True) -> str:
+    """Async variant of cached_call_llm (same cache, sqlite I/O off the event loop)."""
+    if not use_cache:
+        return await call_llm_async(prompt)
+    key = _cache_key(prompt)
+    response = await asyncio.to_thread(_cache_lookup, key)
+    if response is None:
+        response = await call_llm_async(prompt)
+        await asyncio.to_thread(_cache_store, key, response)
+    return response
+
+
 def format_reviews(reviews: list, max_reviews: int = 200) -> str:
     """Format reviews for prompt with review_id."""
-    parts = []
-    for i, rev in enumerate(reviews[:max_reviews]):
-        review_id = rev.get("review_id", f"review_{i}")
-        date = rev["date"][:10]
-        text = rev["text"][:600] + "..." if len(rev["text"]) > 600 else rev["text"]
-        parts.append(f"[review_id: {review_id}] [date: {date}]\n{text}\n")
-    return "\n".join(parts)
-
+    # One join over the fragments; truncation is done inside the f-string
+    # so no intermediate "text + '...'" string is built per review
+    return "\n".join(
+        f"[review_id: {rev.get('review_id', f'review_{i}')}] [date: {rev.get('date10') or rev['date'][:10]}]\n"
+        f"{rev['text'][:600]}{'...' if len(rev['text']) > 600 else ''}\n"
+        for i, rev in enumerate(reviews[:max_reviews])
+    )
 
-def evaluate_single_restaurant(name: str, dataset: dict, max_reviews: int = 200) -> dict:
-    """Evaluate ONE restaurant with LLM."""
-    if name not in dataset:
-        return {"error": f"Restaurant not found: {name}"}
 
-    item = dataset[name]
-    biz = item["business"]
+def build_prompt(name: str, item: dict, max_reviews: int = 200) -> str:
+    """Agenda-spec prompt for one restaurant's dataset item."""
     reviews = item["reviews"][:max_reviews]
-
-    prompt = AGENDA_SPEC_PROMPT.format(
+    return AGENDA_SPEC + RESTAURANT_SECTION.format(
         restaurant_name=name,
-        categories=biz.get("categories", "N/A"),
+        categories=item["business"].get("categories", "N/A"),
         reviews_text=format_reviews(reviews, max_reviews)
     )
 
-    response = call_llm(prompt)
 
-    # Parse JSON from response
-    import re
+def parse_response(response: str) -> dict:
+    """Parse the JSON verdict from an LLM response."""
     json_match = re.search(r'\{[\s\S]*\}', response)
     if json_match:
         try:
@@ -185,6 +267,32 @@ def evaluate_single_restaurant(name: str, dataset: dict, max_reviews: int = 200)
     return {"raw_response": response, "error": "No JSON found"}
 
 
+def evaluate_single_restaurant(name: str, dataset: dict, max_reviews: int = 200,
+                               use_cache: bool = True) -> dict:
+    """Evaluate ONE restaurant with LLM."""
+    if name not in dataset:
+        return {"error": f"Restaurant not found: {name}"}
+    prompt = build_prompt(name, dataset[name], max_reviews)
+    return parse_response(cached_call_llm(prompt, use_cache))
+
+
+async def evaluate_single_restaurant_async(name: str, dataset: dict, max_reviews: int = 200,
+                                           use_cache: bool = True) -> dict:
+    """Async variant of evaluate_single_restaurant."""
+    if name not in dataset:
+        return {"error": f"Restaurant not found: {name}"}
+    prompt = build_prompt(name, dataset[name], max_reviews)
+    return parse_response(await cached_call_llm_async(prompt, use_cache))
+
+
+async def evaluate_restaurants_async(names: list, dataset: dict, max_reviews: int = 200,
+                                     use_cache: bool = True) -> list:
+    """Evaluate restaurants concurrently (independent calls); results follow `names` order."""
+    return await asyncio.gather(*(
+        evaluate_single_restaurant_async(name, dataset, max_reviews, use_cache) for name in names
+    ))
+
+
 def evaluate_against_agenda_spec(result: dict) -> dict:
     """
     Evaluate if the LLM's verdict is consistent with its own evidence per the agenda spec.
@@ -242,7 +350,7 @@ def evaluate_against_agenda_spec(result: dict) -> dict:
     }
 
 
-def run_test(max_reviews: int = 200):
+def run_test(max_reviews: int = 200, use_cache: bool = True):
     """Run the direct LLM test with agenda spec v2."""
     print("=" * 70)
     print("ALLERGY SAFETY - DIRECT LLM (Agenda Spec V2)")
@@ -251,7 +359,7 @@ def run_test(max_reviews: int = 200):
     # Load data
     print("\n1. Loading data...")
     test_restaurants = get_test_restaurants()
-    dataset = load_dataset()
+    dataset = load_dataset(r["name"] for r in test_restaurants)
 
     print(f"   Test set: {len(test_restaurants)} restaurants")
     print(f"   Reviews per restaurant: up to {max_reviews}")
@@ -259,12 +367,15 @@ def run_test(max_reviews: int = 200):
     # Evaluate each restaurant
     print(f"\n2. Evaluating each restaurant...")
 
+    # All restaurants are independent - issue the LLM calls concurrently
+    predictions = asyncio.run(evaluate_restaurants_async(
+        [r["name"] for r in test_restaurants], dataset, max_reviews, use_cache))
+
     results = []
-    for i, r in enumerate(test_restaurants):
+    for i, (r, prediction) in enumerate(zip(test_restaurants, predictions)):
         name = r["name"]
-        print(f"   [{i+1}/{len(test_restaurants)}] {name}...", end=" ", flush=True)
+        print(f"   [{i+1}/{len(test_restaurants)}] {name}...", end=" ")
 
-        prediction = evaluate_single_restaurant(name, dataset, max_reviews)
         prediction["restaurant_name"] = name
         prediction["gt_verdict"] = r["gt_verdict"]
 
@@ -348,6 +459,7 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--reviews", type=int, default=200, help="Reviews per restaurant")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM (ignore cached responses)")
     args = parser.parse_args()
 
-    run_test(max_reviews=args.reviews)
+    run_test(max_reviews=args.reviews, use_cache=not args.no_cache)
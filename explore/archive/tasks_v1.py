@@ -9,76 +9,229 @@ Each task defines:
 - TOLERANCES: dict (field tolerances for scoring)
 """
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field, fields
+from functools import cached_property
 from typing import List, Dict, Any
 
+import numpy as np
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+    ahocorasick = None
+
+
+def _tagged_automaton(tagged_words):
+    """Aho-Corasick automaton mapping each word to the tuple of tags it carries."""
+    automaton = ahocorasick.Automaton()
+    for w, tag in tagged_words:
+        automaton.add_word(w, automaton.get(w, ()) + (tag,))
+    automaton.make_automaton()
+    return automaton
+
+
+def _lexicon_finder(words):
+    """
+    Return f(text) -> iterator over positions where any of `words` occurs.
+
+    The whole lexicon is scanned in one pass: as an Aho-Corasick automaton
+    with pyahocorasick, else as one precompiled regex alternation.
+    """
+    words = tuple(words)
+    if HAS_AHOCORASICK:
+        automaton = _tagged_automaton((w, w) for w in words)
+        return lambda text: (end for end, _ in automaton.iter(text))
+    pattern = re.compile('|'.join(map(re.escape, words)))
+    return lambda text: (m.start() for m in pattern.finditer(text))
+
+
+def _joined(texts_lower: List[str]):
+    """
+    Texts joined by NUL into one string, plus each text's start offset in it.
+
+    Keywords never contain NUL, so no match can straddle two texts and every
+    hit position maps back to its text with a binary search over the offsets.
+    """
+    lengths = np.fromiter((len(t) + 1 for t in texts_lower), dtype=np.int64, count=len(texts_lower))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return '\0'.join(texts_lower), starts
+
+
+def _owners(starts: np.ndarray, positions) -> np.ndarray:
+    """Index of the text each joined-string position falls in."""
+    return np.searchsorted(starts, np.asarray(positions, dtype=np.int64), side='right') - 1
+
+
+def _lexicon_matcher(words):
+    """Return f(text_lower) -> bool: does any of `words` occur as a substring?"""
+    find = _lexicon_finder(words)
+    return lambda text_lower: next(find(text_lower), None) is not None
+
+
+def _lexicon_scanner(words):
+    """
+    Return f(texts_lower) -> bool mask: which texts contain any of `words`?
+
+    Scans all texts in a single call over their joined string instead of
+    one search per text.
+    """
+    find = _lexicon_finder(words)
+
+    def scan(texts_lower: List[str]) -> np.ndarray:
+        mask = np.zeros(len(texts_lower), dtype=bool)
+        if texts_lower:
+            blob, starts = _joined(texts_lower)
+            positions = list(find(blob))
+            if positions:
+                mask[_owners(starts, positions)] = True
+        return mask
+
+    return scan
+
+
+def _rounded(ndigits: int):
+    """Field whose float value is rounded to `ndigits` when serialized."""
+    return field(metadata={'ndigits': ndigits})
+
+
+class _GroundTruthOutput:
+    """
+    Ground truths keep full-precision floats; rounding happens only when
+    they are turned into output via to_dict().
+    """
+
+    def to_dict(self, precision: int = None) -> Dict[str, Any]:
+        """
+        Field dict with float values rounded to `precision` digits, or to
+        each field's own `ndigits` when `precision` is None.
+        """
+        out = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            ndigits = f.metadata.get('ndigits') if precision is None else precision
+            if ndigits is not None and isinstance(value, float):
+                value = round(value, ndigits)
+            out[f.name] = value
+        return out
 
 
 @dataclass
-class TaskCGroundTruth:
+class TaskCGroundTruth(_GroundTruthOutput):
     n_total: int
     n_positive_text: int
     n_negative_text: int
     n_aligned: int
     n_misaligned: int
-    alignment_ratio: float
-    avg_aligned_stars: float
-    avg_misaligned_stars: float
+    alignment_ratio: float = _rounded(3)
+    avg_aligned_stars: float = _rounded(2)
+    avg_misaligned_stars: float = _rounded(2)
+
+
+POSITIVE_WORDS = ['amazing', 'excellent', 'great', 'wonderful', 'fantastic',
+                  'delicious', 'perfect', 'best', 'love', 'loved', 'awesome',
+                  'incredible', 'outstanding', 'superb', 'recommend']
+NEGATIVE_WORDS = ['terrible', 'awful', 'horrible', 'worst', 'bad', 'poor',
+                  'disappointing', 'disappointed', 'disgusting', 'never again',
+                  'waste', 'avoid', 'mediocre', 'overpriced', 'cold']
+
+_match_positive = _lexicon_matcher(POSITIVE_WORDS)
+_match_negative = _lexicon_matcher(NEGATIVE_WORDS)
+_scan_positive = _lexicon_scanner(POSITIVE_WORDS)
+_scan_negative = _lexicon_scanner(NEGATIVE_WORDS)
+
+
+def lower_texts(reviews: List[Any]) -> List[str]:
+    """Lowercased review texts, computed once and shared by the keyword-based tasks."""
+    return [r['text'].lower() for r in reviews]
 
 
 def _has_positive_sentiment(text: str) -> bool:
-    positive_words = ['amazing', 'excellent', 'great', 'wonderful', 'fantastic',
-                     'delicious', 'perfect', 'best', 'love', 'loved', 'awesome',
-                     'incredible', 'outstanding', 'superb', 'recommend']
-    text_lower = text.lower()
-    return any(word in text_lower for word in positive_words)
+    return _match_positive(text.lower())
 
 
 def _has_negative_sentiment(text: str) -> bool:
-    negative_words = ['terrible', 'awful', 'horrible', 'worst', 'bad', 'poor',
-                     'disappointing', 'disappointed', 'disgusting', 'never again',
-                     'waste', 'avoid', 'mediocre', 'overpriced', 'cold']
-    text_lower = text.lower()
-    return any(word in text_lower for word in negative_words)
+    return _match_negative(text.lower())
+
 
+def _stars_array(reviews: List[Any]) -> np.ndarray:
+    return np.fromiter((r['stars'] for r in reviews), dtype=np.float64, count=len(reviews))
 
-def compute_task_c_ground_truth(reviews: List[Any], restaurant: Any = None) -> TaskCGroundTruth:
+
+class ReviewFeatures:
+    """
+    Per-review features shared by the keyword-based tasks (C, D, F).
+
+    Build once per review set and pass as `features=` to each task so the
+    texts are lowercased, scanned and tagged once rather than once per task.
+    Each feature is computed on first use.
+    """
+
+    def __init__(self, reviews: List[Any]):
+        self.reviews = reviews
+
+    @cached_property
+    def stars(self) -> np.ndarray:
+        return _stars_array(self.reviews)
+
+    @cached_property
+    def texts_lower(self) -> List[str]:
+        return lower_texts(self.reviews)
+
+    @cached_property
+    def is_positive(self) -> np.ndarray:
+        return _scan_positive(self.texts_lower)
+
+    @cached_property
+    def is_negative(self) -> np.ndarray:
+        return _scan_negative(self.texts_lower)
+
+    @cached_property
+    def aspects(self) -> List[Dict[str, str]]:
+        masks = _scan_aspects(self.texts_lower)
+        aspects = [{} for _ in self.reviews]
+        for aspect in ASPECT_LEXICONS:
+            pos, neg = masks[(aspect, 'positive')], masks[(aspect, 'negative')]
+            for i in np.flatnonzero(pos | neg):
+                aspects[i][aspect] = 'positive' if pos[i] else 'negative'
+        return aspects
+
+
+def _mean_stars(stars: np.ndarray, mask: np.ndarray) -> float:
+    """Mean of stars[mask] (0.0 if the mask is empty)."""
+    n = int(np.count_nonzero(mask))
+    return float(stars[mask].sum()) / n if n else 0.0
+
+
+def compute_task_c_ground_truth(reviews: List[Any], restaurant: Any = None,
+                                features: ReviewFeatures = None) -> TaskCGroundTruth:
     n = len(reviews)
+    if features is None:
+        features = ReviewFeatures(reviews)
 
-    positive_text = []
-    negative_text = []
-    aligned = []
-    misaligned = []
+    stars = features.stars
+    is_pos = features.is_positive
+    is_neg = features.is_negative
 
-    for r in reviews:
-        is_pos = _has_positive_sentiment(r['text'])
-        is_neg = _has_negative_sentiment(r['text'])
-
-        if is_pos and not is_neg:
-            positive_text.append(r)
-            if r['stars'] >= 4:
-                aligned.append(r)
-            else:
-                misaligned.append(r)
-        elif is_neg and not is_pos:
-            negative_text.append(r)
-            if r['stars'] <= 2:
-                aligned.append(r)
-            else:
-                misaligned.append(r)
-
-    n_classified = len(positive_text) + len(negative_text)
+    positive_text = is_pos & ~is_neg
+    negative_text = is_neg & ~is_pos
+    aligned = (positive_text & (stars >= 4)) | (negative_text & (stars <= 2))
+    misaligned = (positive_text | negative_text) & ~aligned
+
+    n_aligned = int(np.count_nonzero(aligned))
+    n_classified = int(np.count_nonzero(positive_text)) + int(np.count_nonzero(negative_text))
 
     return TaskCGroundTruth(
         n_total=n,
-        n_positive_text=len(positive_text),
-        n_negative_text=len(negative_text),
-        n_aligned=len(aligned),
-        n_misaligned=len(misaligned),
-        alignment_ratio=round(len(aligned) / n_classified, 3) if n_classified else 0.0,
-        avg_aligned_stars=round(sum(r['stars'] for r in aligned) / len(aligned), 2) if aligned else 0.0,
-        avg_misaligned_stars=round(sum(r['stars'] for r in misaligned) / len(misaligned), 2) if misaligned else 0.0,
+        n_positive_text=int(np.count_nonzero(positive_text)),
+        n_negative_text=int(np.count_nonzero(negative_text)),
+        n_aligned=n_aligned,
+        n_misaligned=int(np.count_nonzero(misaligned)),
+        alignment_ratio=n_aligned / n_classified if n_classified else 0.0,
+        avg_aligned_stars=_mean_stars(stars, aligned),
+        avg_misaligned_stars=_mean_stars(stars, misaligned),
     )
 
 
@@ -110,49 +263,78 @@ TASK_C_TOLERANCES = {'alignment_ratio': 0.1, 'avg_aligned_stars': 0.2, 'avg_misa
 # =============================================================================
 
 def _detect_aspects(text: str) -> Dict[str, str]:
-    text_lower = text.lower()
-    aspects = {}
+    return _detect_aspects_lower(text.lower())
+
+
+# Aspect -> (positive keywords, negative keywords); positive wins if both match
+ASPECT_LEXICONS = {
+    'food': (['delicious', 'tasty', 'fresh', 'amazing food', 'great food', 'excellent food'],
+             ['bland', 'cold food', 'stale', 'undercooked', 'overcooked', 'tasteless']),
+    'service': (['friendly', 'attentive', 'great service', 'excellent service', 'helpful'],
+                ['rude', 'slow service', 'ignored', 'terrible service', 'inattentive']),
+    'wait': (['no wait', 'seated immediately', 'quick', 'fast'],
+             ['long wait', 'waited forever', 'slow', 'took forever', 'hour wait']),
+    'value': (['great value', 'worth it', 'reasonable price', 'good price', 'affordable'],
+              ['overpriced', 'expensive', 'not worth', 'rip off', 'too pricey']),
+    'ambiance': (['cozy', 'nice atmosphere', 'great ambiance', 'romantic', 'beautiful'],
+                 ['loud', 'noisy', 'crowded', 'dirty', 'cramped']),
+}
+
 
-    food_pos = ['delicious', 'tasty', 'fresh', 'amazing food', 'great food', 'excellent food']
-    food_neg = ['bland', 'cold food', 'stale', 'undercooked', 'overcooked', 'tasteless']
-    if any(w in text_lower for w in food_pos):
-        aspects['food'] = 'positive'
-    elif any(w in text_lower for w in food_neg):
-        aspects['food'] = 'negative'
-
-    service_pos = ['friendly', 'attentive', 'great service', 'excellent service', 'helpful']
-    service_neg = ['rude', 'slow service', 'ignored', 'terrible service', 'inattentive']
-    if any(w in text_lower for w in service_pos):
-        aspects['service'] = 'positive'
-    elif any(w in text_lower for w in service_neg):
-        aspects['service'] = 'negative'
-
-    wait_pos = ['no wait', 'seated immediately', 'quick', 'fast']
-    wait_neg = ['long wait', 'waited forever', 'slow', 'took forever', 'hour wait']
-    if any(w in text_lower for w in wait_pos):
-        aspects['wait'] = 'positive'
-    elif any(w in text_lower for w in wait_neg):
-        aspects['wait'] = 'negative'
-
-    value_pos = ['great value', 'worth it', 'reasonable price', 'good price', 'affordable']
-    value_neg = ['overpriced', 'expensive', 'not worth', 'rip off', 'too pricey']
-    if any(w in text_lower for w in value_pos):
-        aspects['value'] = 'positive'
-    elif any(w in text_lower for w in value_neg):
-        aspects['value'] = 'negative'
-
-    ambiance_pos = ['cozy', 'nice atmosphere', 'great ambiance', 'romantic', 'beautiful']
-    ambiance_neg = ['loud', 'noisy', 'crowded', 'dirty', 'cramped']
-    if any(w in text_lower for w in ambiance_pos):
-        aspects['ambiance'] = 'positive'
-    elif any(w in text_lower for w in ambiance_neg):
-        aspects['ambiance'] = 'negative'
+_ASPECT_TAGS = [((aspect, polarity), words)
+                for aspect, (pos_words, neg_words) in ASPECT_LEXICONS.items()
+                for polarity, words in (('positive', pos_words), ('negative', neg_words))]
 
+
+def _aspect_tagger():
+    """
+    Return (f(text_lower) -> set of (aspect, polarity) keyword hits,
+            f(texts_lower) -> {(aspect, polarity): bool mask}).
+
+    With pyahocorasick every aspect lexicon shares one automaton, so a text
+    (or the joined batch of texts) is scanned once for all ten keyword lists.
+    """
+    if HAS_AHOCORASICK:
+        automaton = _tagged_automaton((w, tag) for tag, words in _ASPECT_TAGS for w in words)
+
+        def tag_many(texts_lower):
+            masks = {tag: np.zeros(len(texts_lower), dtype=bool) for tag, _ in _ASPECT_TAGS}
+            if texts_lower:
+                blob, starts = _joined(texts_lower)
+                hits = list(automaton.iter(blob))
+                if hits:
+                    owners = _owners(starts, [end for end, _ in hits])
+                    for owner, (_, tags) in zip(owners.tolist(), hits):
+                        for tag in tags:
+                            masks[tag][owner] = True
+            return masks
+
+        return (lambda text_lower: {tag for _, tags in automaton.iter(text_lower) for tag in tags},
+                tag_many)
+    # One alternation per lexicon (a single combined regex would miss
+    # overlapping hits such as 'slow service' vs 'slow')
+    matchers = [(tag, _lexicon_matcher(words)) for tag, words in _ASPECT_TAGS]
+    scanners = [(tag, _lexicon_scanner(words)) for tag, words in _ASPECT_TAGS]
+    return (lambda text_lower: {tag for tag, match in matchers if match(text_lower)},
+            lambda texts_lower: {tag: scan(texts_lower) for tag, scan in scanners})
+
+
+_tag_aspects, _scan_aspects = _aspect_tagger()
+
+
+def _detect_aspects_lower(text_lower: str) -> Dict[str, str]:
+    hits = _tag_aspects(text_lower)
+    aspects = {}
+    for aspect in ASPECT_LEXICONS:
+        if (aspect, 'positive') in hits:
+            aspects[aspect] = 'positive'
+        elif (aspect, 'negative') in hits:
+            aspects[aspect] = 'negative'
     return aspects
 
 
 @dataclass
-class TaskDGroundTruth:
+class TaskDGroundTruth(_GroundTruthOutput):
     n_total: int
     n_multi_aspect: int
     n_food_positive: int
@@ -160,12 +342,15 @@ class TaskDGroundTruth:
     n_wait_negative: int
     n_compensation_pattern: int
     n_systemic_negative: int
-    avg_multi_aspect_stars: float
-    avg_single_aspect_stars: float
+    avg_multi_aspect_stars: float = _rounded(2)
+    avg_single_aspect_stars: float = _rounded(2)
 
 
-def compute_task_d_ground_truth(reviews: List[Any], restaurant: Any = None) -> TaskDGroundTruth:
+def compute_task_d_ground_truth(reviews: List[Any], restaurant: Any = None,
+                                features: ReviewFeatures = None) -> TaskDGroundTruth:
     n = len(reviews)
+    if features is None:
+        features = ReviewFeatures(reviews)
 
     multi_aspect = []
     single_aspect = []
@@ -175,8 +360,7 @@ def compute_task_d_ground_truth(reviews: List[Any], restaurant: Any = None) -> T
     compensation = 0
     systemic_negative = 0
 
-    for r in reviews:
-        aspects = _detect_aspects(r['text'])
+    for r, aspects in zip(reviews, features.aspects):
 
         if len(aspects) >= 2:
             multi_aspect.append(r)
@@ -205,8 +389,8 @@ def compute_task_d_ground_truth(reviews: List[Any], restaurant: Any = None) -> T
         n_wait_negative=wait_negative,
         n_compensation_pattern=compensation,
         n_systemic_negative=systemic_negative,
-        avg_multi_aspect_stars=round(sum(r['stars'] for r in multi_aspect) / len(multi_aspect), 2) if multi_aspect else 0.0,
-        avg_single_aspect_stars=round(sum(r['stars'] for r in single_aspect) / len(single_aspect), 2) if single_aspect else 0.0,
+        avg_multi_aspect_stars=sum(r['stars'] for r in multi_aspect) / len(multi_aspect) if multi_aspect else 0.0,
+        avg_single_aspect_stars=sum(r['stars'] for r in single_aspect) / len(single_aspect) if single_aspect else 0.0,
     )
 
 
@@ -238,53 +422,57 @@ TASK_D_TOLERANCES = {'avg_multi_aspect_stars': 0.2, 'avg_single_aspect_stars': 0
 # =============================================================================
 
 @dataclass
-class TaskFGroundTruth:
+class TaskFGroundTruth(_GroundTruthOutput):
     n_total: int
     restaurant_price_tier: int
     restaurant_noise_level: str
     n_price_complaints: int
     n_noise_complaints: int
-    price_complaint_ratio: float
-    noise_complaint_ratio: float
-    avg_stars_price_complainers: float
-    price_adjusted_score: float
+    price_complaint_ratio: float = _rounded(3)
+    noise_complaint_ratio: float = _rounded(3)
+    avg_stars_price_complainers: float = _rounded(2)
+    price_adjusted_score: float = _rounded(3)
 
 
 @dataclass
-class TaskGGroundTruth:
+class TaskGGroundTruth(_GroundTruthOutput):
     n_reviews_with_wait: int
     n_worth_it: int
     n_not_worth_it: int
-    wait_redeemability_ratio: float
+    wait_redeemability_ratio: float = _rounded(3)
     most_common_wait_complaint: str
 
 
 @dataclass
-class TaskHGroundTruth:
+class TaskHGroundTruth(_GroundTruthOutput):
     top_staff_member: str
     n_mentions: int
-    avg_stars_with_staff: float
+    avg_stars_with_staff: float = _rounded(2)
     staff_sentiment_summary: str
 
 
 
-def compute_task_f_ground_truth(reviews: List[Any], restaurant: Any) -> TaskFGroundTruth:
-    n = len(reviews)
+PRICE_COMPLAINT_WORDS = ['expensive', 'overpriced', 'pricey', 'not worth', 'rip off']
+NOISE_COMPLAINT_WORDS = ['loud', 'noisy', 'couldn\'t hear', 'too loud']
 
-    price_complaints = []
-    noise_complaints = []
+_scan_price_complaint = _lexicon_scanner(PRICE_COMPLAINT_WORDS)
+_scan_noise_complaint = _lexicon_scanner(NOISE_COMPLAINT_WORDS)
 
-    for r in reviews:
-        text_lower = r['text'].lower()
 
-        if any(w in text_lower for w in ['expensive', 'overpriced', 'pricey', 'not worth', 'rip off']):
-            price_complaints.append(r)
+def compute_task_f_ground_truth(reviews: List[Any], restaurant: Any,
+                                features: ReviewFeatures = None) -> TaskFGroundTruth:
+    n = len(reviews)
+    if features is None:
+        features = ReviewFeatures(reviews)
 
-        if any(w in text_lower for w in ['loud', 'noisy', 'couldn\'t hear', 'too loud']):
-            noise_complaints.append(r)
+    stars = features.stars
+    price_mask = _scan_price_complaint(features.texts_lower)
+    noise_mask = _scan_noise_complaint(features.texts_lower)
+    n_price = int(np.count_nonzero(price_mask))
+    n_noise = int(np.count_nonzero(noise_mask))
 
-    price_ratio = len(price_complaints) / n if n else 0
-    noise_ratio = len(noise_complaints) / n if n else 0
+    price_ratio = n_price / n if n else 0
+    noise_ratio = n_noise / n if n else 0
 
     attrs = restaurant.get('attributes', {})
     price_tier = int(attrs.get('RestaurantsPriceRange2', 2))
@@ -295,12 +483,12 @@ def compute_task_f_ground_truth(reviews: List[Any], restaurant: Any) -> TaskFGro
         n_total=n,
         restaurant_price_tier=price_tier,
         restaurant_noise_level=str(noise_level),
-        n_price_complaints=len(price_complaints),
-        n_noise_complaints=len(noise_complaints),
-        price_complaint_ratio=round(price_ratio, 3),
-        noise_complaint_ratio=round(noise_ratio, 3),
-        avg_stars_price_complainers=round(sum(r['stars'] for r in price_complaints) / len(price_complaints), 2) if price_complaints else 0.0,
-        price_adjusted_score=round(max(0, price_adjusted), 3),
+        n_price_complaints=n_price,
+        n_noise_complaints=n_noise,
+        price_complaint_ratio=price_ratio,
+        noise_complaint_ratio=noise_ratio,
+        avg_stars_price_complainers=_mean_stars(stars, price_mask),
+        price_adjusted_score=max(0, price_adjusted),
     )
 
 
@@ -350,18 +538,18 @@ def compute_task_g_ground_truth(reviews: List[Any], restaurant: Any) -> TaskGGro
         n_reviews_with_wait=n_wait,
         n_worth_it=n_worth,
         n_not_worth_it=n_not,
-        wait_redeemability_ratio=round(ratio, 3),
+        wait_redeemability_ratio=ratio,
         most_common_wait_complaint=most_common
     )
 
 
 @dataclass
-class TaskIGroundTruth:
+class TaskIGroundTruth(_GroundTruthOutput):
     top_user_name: str
     top_user_useful_count: int
     targeted_dish: str
     n_other_reviews_of_dish: int
-    avg_stars_contradicting_dish: float
+    avg_stars_contradicting_dish: float = _rounded(2)
 
 
 def compute_task_i_ground_truth(reviews: List[Any], restaurant: Any) -> TaskIGroundTruth:
@@ -402,7 +590,7 @@ def compute_task_i_ground_truth(reviews: List[Any], restaurant: Any) -> TaskIGro
         top_user_useful_count=useful_count,
         targeted_dish=target_dish,
         n_other_reviews_of_dish=len(other_revs),
-        avg_stars_contradicting_dish=round(avg_stars, 2)
+        avg_stars_contradicting_dish=avg_stars
     )
 
 def compute_task_h_ground_truth(reviews: List[Any], restaurant: Any) -> TaskHGroundTruth:
@@ -438,51 +626,67 @@ def compute_task_h_ground_truth(reviews: List[Any], restaurant: Any) -> TaskHGro
     return TaskHGroundTruth(
         top_staff_member=name,
         n_mentions=len(revs),
-        avg_stars_with_staff=round(avg_stars, 2),
+        avg_stars_with_staff=avg_stars,
         staff_sentiment_summary=sentiment
     )
 
 
 @dataclass
-class TaskJGroundTruth:
-    avg_useful_service: float
-    avg_useful_food: float
+class TaskJGroundTruth(_GroundTruthOutput):
+    avg_useful_service: float = _rounded(2)
+    avg_useful_food: float = _rounded(2)
     prioritized_aspect: str
-    avg_stars_prioritized: float
+    avg_stars_prioritized: float = _rounded(2)
 
 
 def compute_task_j_ground_truth(reviews: List[Any], restaurant: Any) -> TaskJGroundTruth:
     """
     Task J: Weighted Aspect Priority.
     """
-    service_revs = [r for r in reviews if any(w in r['text'].lower() for w in ['service', 'waitress', 'waiter', 'server', 'staff'])]
-    food_revs = [r for r in reviews if any(w in r['text'].lower() for w in ['food', 'dish', 'meal', 'eat', 'delicious', 'tasty'])]
-    
-    avg_u_service = sum(r.get('useful', 0) for r in service_revs) / len(service_revs) if service_revs else 0.0
-    avg_u_food = sum(r.get('useful', 0) for r in food_revs) / len(food_revs) if food_revs else 0.0
-    
+    service_words = ['service', 'waitress', 'waiter', 'server', 'staff']
+    food_words = ['food', 'dish', 'meal', 'eat', 'delicious', 'tasty']
+
+    # One pass: per-group count, useful sum and stars sum
+    n_service = useful_service = stars_service = 0
+    n_food = useful_food = stars_food = 0
+    for r in reviews:
+        text_lower = r['text'].lower()
+        useful = r.get('useful', 0)
+        if any(w in text_lower for w in service_words):
+            n_service += 1
+            useful_service += useful
+            stars_service += r['stars']
+        if any(w in text_lower for w in food_words):
+            n_food += 1
+            useful_food += useful
+            stars_food += r['stars']
+
+    avg_u_service = useful_service / n_service if n_service else 0.0
+    avg_u_food = useful_food / n_food if n_food else 0.0
+
     if avg_u_service > avg_u_food:
         priority = "service"
-        target_revs = service_revs
+        n_target, stars_target = n_service, stars_service
     elif avg_u_food > avg_u_service:
         priority = "food"
-        target_revs = food_revs
+        n_target, stars_target = n_food, stars_food
     else:
+        # Draw: both groups together (reviews in both count twice)
         priority = "draw"
-        target_revs = service_revs + food_revs
-        
-    avg_stars = sum(r['stars'] for r in target_revs) / len(target_revs) if target_revs else 0.0
+        n_target, stars_target = n_service + n_food, stars_service + stars_food
+
+    avg_stars = stars_target / n_target if n_target else 0.0
     
     return TaskJGroundTruth(
-        avg_useful_service=round(avg_u_service, 2),
-        avg_useful_food=round(avg_u_food, 2),
+        avg_useful_service=avg_u_service,
+        avg_useful_food=avg_u_food,
         prioritized_aspect=priority,
-        avg_stars_prioritized=round(avg_stars, 2)
+        avg_stars_prioritized=avg_stars
     )
 
 
 @dataclass
-class TaskKGroundTruth:
+class TaskKGroundTruth(_GroundTruthOutput):
     top_staff_member: str
     earliest_rating: float
     latest_rating: float
@@ -658,6 +862,10 @@ def load_g1_semantic_gt():
     return G1_SEMANTIC_GT_CACHE
 
 
+_scan_severe_reaction = _lexicon_scanner(['reaction', 'hospital'])
+_scan_accommodation = _lexicon_scanner(['accommodat'])
+
+
 def compute_task_g1_ground_truth(reviews: List[Any], restaurant: Any) -> TaskG1GroundTruth:
     """
     Task G1 v14: Severe Peanut Allergy (Semantic Reasoning).
@@ -682,8 +890,9 @@ def compute_task_g1_ground_truth(reviews: List[Any], restaurant: Any) -> TaskG1G
     
     # Fallback for validation/unknown restaurants (Simple heuristic)
     # This ensures code doesn't crash if cache is missing or for new data
-    severe = sum(1 for r in reviews if 'reaction' in r['text'].lower() or 'hospital' in r['text'].lower())
-    pos = sum(1 for r in reviews if 'accommodat' in r['text'].lower())
+    texts_lower = lower_texts(reviews)
+    severe = int(np.count_nonzero(_scan_severe_reaction(texts_lower)))
+    pos = int(np.count_nonzero(_scan_accommodation(texts_lower)))
     
     return TaskG1GroundTruth(
         firsthand_severe_count=severe,
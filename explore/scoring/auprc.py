@@ -15,7 +15,7 @@ See doc/ORDINAL_AUPRC.md for methodology and references.
 import json
 import numpy as np
 from sklearn.metrics import average_precision_score, precision_recall_curve
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 
 
 # Ordinal class mapping
@@ -52,7 +52,7 @@ def compute_primitive_accuracy(
     parsed: Dict,
     ground_truth: Dict,
     tolerances: Dict[str, float],
-    scoring_fields: Optional[List[str]] = None
+    scoring_fields: Optional[Sequence[str]] = None
 ) -> float:
     """
     Compute primitive accuracy for a single restaurant.
@@ -67,7 +67,7 @@ def compute_primitive_accuracy(
         Accuracy in [0, 1] = fraction of primitives within tolerance
     """
     if scoring_fields is None:
-        scoring_fields = list(tolerances.keys())
+        scoring_fields = tuple(tolerances.keys())
 
     n_correct = 0
     n_total = 0
@@ -99,7 +99,7 @@ def compute_primitive_accuracy(
 def compute_avg_primitive_accuracy(
     runs: List[Dict],
     tolerances: Optional[Dict[str, float]] = None,
-    scoring_fields: Optional[List[str]] = None
+    scoring_fields: Optional[Sequence[str]] = None
 ) -> Tuple[float, List[float]]:
     """
     Compute average primitive accuracy across all restaurants.
@@ -129,7 +129,7 @@ def compute_avg_primitive_accuracy(
                 tolerances = DEFAULT_TOLERANCES_V1
 
         if scoring_fields is None:
-            scoring_fields = [k for k in tolerances.keys() if k != 'final_risk_score']
+            scoring_fields = tuple(k for k in tolerances if k != 'final_risk_score')
 
         acc = compute_primitive_accuracy(parsed, gt, tolerances, scoring_fields)
         accuracies.append(acc)
@@ -28,15 +28,42 @@ Usage:
 # Formula version: "v1" (original) or "v2" (harder with trust, trajectory, logic)
 DEFAULT_FORMULA_VERSION = "v1"
 
+import os
 import json
-import math
+import mmap
+import hashlib
+import tempfile
+import zipfile
+from collections import Counter
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    njit = prange = None
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 JUDGMENTS_FILE = DATA_DIR / "semantic_gt" / "task_G1a" / "judgments.json"
 OUTPUT_FILE = DATA_DIR / "semantic_gt" / "task_G1a" / "computed_gt.json"
+# Binary cache of the flat review arrays, keyed on the judgments file's mtime/size
+# and a hash of the encoding (see _soa_schema_hash)
+SOA_CACHE_FILE = JUDGMENTS_FILE.with_name("judgments_soa.npz")
+# Bump when the flat-array encoding changes (_reviews_to_soa / _build_flat_soa / code packing)
+SOA_CACHE_VERSION = 1
 
 # Cuisine risk modifiers (peanut/nut usage prevalence)
 CUISINE_RISK_BASE = {
@@ -58,7 +85,7 @@ CUISINE_RISK_BASE = {
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class G1GroundTruth:
     """All GT primitives for G1.1 V1 - deterministically computed."""
     # Layer 1 Aggregates
@@ -92,7 +119,7 @@ class G1GroundTruth:
     verdict: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class G1GroundTruthV2:
     """All GT primitives for G1.1 V2 - with trust, trajectory, and logic operators."""
     # Layer 1 Aggregates (same as V1)
@@ -142,63 +169,316 @@ class G1GroundTruthV2:
     verdict: str
 
 
+_RISK_CATEGORIES = frozenset(CUISINE_RISK_BASE)
+
+
 def get_cuisine_modifier(categories: str) -> float:
     """Extract highest-risk cuisine modifier from category string."""
-    cats = [c.strip() for c in categories.split(",")]
-    max_risk = CUISINE_RISK_BASE["default"]
-    for cat in cats:
-        if cat in CUISINE_RISK_BASE:
-            max_risk = max(max_risk, CUISINE_RISK_BASE[cat])
-    return max_risk
+    matches = _RISK_CATEGORIES.intersection(c.strip() for c in categories.split(","))
+    return max([CUISINE_RISK_BASE["default"], *(CUISINE_RISK_BASE[c] for c in matches)])
+
+
+def _restaurant_cuisine_modifier(data: Dict) -> float:
+    """Cuisine modifier of a judgments entry (precomputed by load_judgments())."""
+    modifier = data.get("_cuisine_modifier")
+    if modifier is None:
+        modifier = get_cuisine_modifier(data.get("restaurant_meta", {}).get("categories", ""))
+    return modifier
+
+
+# === Structure-of-Arrays encoding ===
+# Per-review judgments are decoded once into parallel NumPy arrays so the
+# Layer-1 aggregation is a handful of mask reductions instead of a Python loop.
+SEV_NONE, SEV_MILD, SEV_MODERATE, SEV_SEVERE = 0, 1, 2, 3
+ACC_OTHER, ACC_FIRSTHAND = 0, 1
+INTER_NONE, INTER_POSITIVE, INTER_NEGATIVE, INTER_BETRAYAL = 0, 1, 2, 3
+
+SEVERITY_CODES = {"none": SEV_NONE, "mild": SEV_MILD, "moderate": SEV_MODERATE, "severe": SEV_SEVERE}
+ACCOUNT_CODES = {"firsthand": ACC_FIRSTHAND}
+INTERACTION_CODES = {"positive": INTER_POSITIVE, "negative": INTER_NEGATIVE, "betrayal": INTER_BETRAYAL}
+
+DEFAULT_YEAR = 2020   # Used for missing/unparseable dates and "no incidents"
+RECENT_YEAR = 2023    # V2 trajectory: incidents from this year on count as recent
+
+# Layer-1 aggregate vector layout (index constants into a float64 array)
+(L1_N_REVIEWS, L1_N_MILD, L1_N_MODERATE, L1_N_SEVERE,
+ L1_N_POSITIVE, L1_N_NEGATIVE, L1_N_BETRAYAL,
+ L1_MAX_YEAR, L1_N_RECENT, L1_N_OLD, L1_TOTAL_WEIGHT) = range(11)
+N_LAYER1 = 11
+
+
+def _parse_year(date_str: Any) -> int:
+    """Year from a 'YYYY-MM-DD ...' date string (DEFAULT_YEAR if unparseable)."""
+    try:
+        return int(date_str[:4])
+    except (ValueError, TypeError):
+        return DEFAULT_YEAR
+
+
+# Column dtypes of the per-review arrays
+SOA_DTYPES = {
+    "idx": np.int32,
+    "sev": np.int8,
+    "acc": np.int8,
+    "inter": np.int8,
+    "stars": np.float64,
+    "useful": np.int32,
+    "year": np.int16,
+    "code": np.uint8,
+}
 
+# "code" packs the three label columns into one byte, (acc << 4) | (sev << 2) | inter,
+# so a single bincount reshaped to (account, severity, interaction) gives every
+# label count at once
+CODE_SHAPE = (2, 4, 4)
+N_CODES = 32
+
+
+# Values assumed for judgment fields a review does not carry
+REVIEW_DEFAULTS = {
+    "idx": 0,
+    "incident_severity": "none",
+    "account_type": "none",
+    "safety_interaction": "none",
+    "stars": 3,
+    "useful": 0,
+}
 
-def compute_gt_from_data(data: Dict) -> G1GroundTruth:
+
+def _normalize_review(r: Dict) -> Dict:
+    """Fill missing judgment fields (in place) and parse the year into '_year'."""
+    for key, default in REVIEW_DEFAULTS.items():
+        if key not in r:
+            r[key] = default
+    if "_year" not in r:
+        r["_year"] = _parse_year(r.get("date", "2020-01-01"))
+    return r
+
+
+def _reviews_to_soa(reviews: List[Dict]) -> Dict[str, np.ndarray]:
     """
-    Compute all GT primitives from judgment data for one restaurant.
-    This is DETERMINISTIC - no LLM calls, just arithmetic.
+    Decode per-review judgments into parallel arrays (one entry per review).
 
-    Args:
-        data: Restaurant judgment data with 'restaurant_meta' and 'reviews' keys
+    Label strings are mapped to small integer codes here, once, so the
+    aggregation never compares strings. Reviews must already be normalized
+    (see _normalize_review), so fields are read without defaults.
+    """
+    n = len(reviews)
+
+    def column(name, values):
+        return np.fromiter(values, dtype=SOA_DTYPES[name], count=n)
+
+    soa = {
+        "idx": column("idx", (r["idx"] for r in reviews)),
+        "sev": column("sev", (SEVERITY_CODES.get(r["incident_severity"], SEV_NONE) for r in reviews)),
+        "acc": column("acc", (ACCOUNT_CODES.get(r["account_type"], ACC_OTHER) for r in reviews)),
+        "inter": column("inter", (INTERACTION_CODES.get(r["safety_interaction"], INTER_NONE)
+                                  for r in reviews)),
+        "stars": column("stars", (r["stars"] for r in reviews)),
+        "useful": column("useful", (r["useful"] for r in reviews)),
+        "year": column("year", (r["_year"] for r in reviews)),
+    }
+    soa["code"] = ((soa["acc"].astype(np.uint8) << 4)
+                   | (soa["sev"].astype(np.uint8) << 2)
+                   | soa["inter"].astype(np.uint8))
+    return soa
 
-    Returns:
-        G1GroundTruth dataclass with all computed primitives
+
+def _slice_soa(soa: Dict[str, np.ndarray], selector) -> Dict[str, np.ndarray]:
+    """Apply the same mask/slice to every column."""
+    return {name: col[selector] for name, col in soa.items()}
+
+
+def _layer1_from_soa(soa: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Layer-1 aggregates for one restaurant (see L1_* for the layout).
+
+    Incidents are firsthand accounts with a non-"none" severity; every judged
+    review counts as allergy-relevant (they all matched the keyword filter).
+    Uses the compiled single-pass kernel when Numba is installed.
+    """
+    if HAS_NUMBA:
+        return _layer1_kernel(soa["sev"], soa["acc"], soa["inter"],
+                              soa["stars"], soa["useful"], soa["year"])
+    return _layer1_numpy(soa)
+
+
+def _layer1_numpy(soa: Dict[str, np.ndarray]) -> np.ndarray:
+    """Layer-1 aggregates via NumPy mask reductions (fallback without Numba)."""
+    sev = soa["sev"]
+    firsthand = soa["acc"] == ACC_FIRSTHAND
+    incident = firsthand & (sev != SEV_NONE)
+    year = soa["year"]
+    n_incidents = np.count_nonzero(incident)
+
+    l1 = np.zeros(N_LAYER1, dtype=np.float64)
+    l1[L1_N_REVIEWS] = len(sev)
+    # All label counts from one histogram of the packed codes
+    hist = np.bincount(soa["code"], minlength=N_CODES).reshape(CODE_SHAPE)
+    l1[L1_N_MILD:L1_N_SEVERE + 1] = hist[ACC_FIRSTHAND].sum(axis=1)[SEV_MILD:]
+    l1[L1_N_POSITIVE:L1_N_BETRAYAL + 1] = hist.sum(axis=(0, 1))[INTER_POSITIVE:]
+    # Running max / recent count straight off the masks - no incident-year copy
+    l1[L1_MAX_YEAR] = np.max(year, where=incident, initial=0)
+    l1[L1_N_RECENT] = np.count_nonzero(incident & (year >= RECENT_YEAR))
+    l1[L1_N_OLD] = n_incidents - l1[L1_N_RECENT]
+    # WEIGHT = (5 - stars) + log(useful + 1), summed over incident reviews
+    l1[L1_TOTAL_WEIGHT] = ((5 - soa["stars"][incident])
+                           + np.log1p(soa["useful"][incident])).sum()
+    return l1
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _layer1_into(l1, sev, acc, inter, stars, useful, year, start, end):
+        """Single-pass Layer-1 reduction over reviews [start, end), in review order."""
+        l1[L1_N_REVIEWS] = end - start
+        for i in range(start, end):
+            if acc[i] == ACC_FIRSTHAND and sev[i] != SEV_NONE:
+                if sev[i] == SEV_MILD:
+                    l1[L1_N_MILD] += 1
+                elif sev[i] == SEV_MODERATE:
+                    l1[L1_N_MODERATE] += 1
+                else:
+                    l1[L1_N_SEVERE] += 1
+                if year[i] > l1[L1_MAX_YEAR]:
+                    l1[L1_MAX_YEAR] = year[i]
+                if year[i] >= RECENT_YEAR:
+                    l1[L1_N_RECENT] += 1
+                else:
+                    l1[L1_N_OLD] += 1
+                l1[L1_TOTAL_WEIGHT] += (5 - stars[i]) + np.log1p(useful[i])
+
+            if inter[i] == INTER_POSITIVE:
+                l1[L1_N_POSITIVE] += 1
+            elif inter[i] == INTER_NEGATIVE:
+                l1[L1_N_NEGATIVE] += 1
+            elif inter[i] == INTER_BETRAYAL:
+                l1[L1_N_BETRAYAL] += 1
+
+    @njit(cache=True)
+    def _layer1_kernel(sev, acc, inter, stars, useful, year):
+        l1 = np.zeros(N_LAYER1)
+        _layer1_into(l1, sev, acc, inter, stars, useful, year, 0, sev.shape[0])
+        return l1
+
+    @njit(cache=True, parallel=True)
+    def _layer1_batch_kernel(sev, acc, inter, stars, useful, year, offsets):
+        """Layer-1 rows for every restaurant; restaurant ri owns reviews offsets[ri]:offsets[ri+1]."""
+        n_restaurants = offsets.shape[0] - 1
+        out = np.zeros((n_restaurants, N_LAYER1))
+        for ri in prange(n_restaurants):
+            _layer1_into(out[ri], sev, acc, inter, stars, useful, year, offsets[ri], offsets[ri + 1])
+        return out
+
+
+def _build_flat_soa(all_judgments: Dict[str, Dict]) -> Dict[str, Any]:
     """
-    reviews = data.get("reviews", [])
-    categories = data.get("restaurant_meta", {}).get("categories", "")
-
-    # === LAYER 1: Count from per-review judgments ===
-    n_mild = n_moderate = n_severe = 0
-    n_positive = n_negative = n_betrayal = 0
-    n_allergy_reviews = 0
-    incident_reviews = []  # For credibility calculation
-
-    for r in reviews:
-        # All judged reviews are allergy-relevant (they matched keywords)
-        n_allergy_reviews += 1
-
-        severity = r.get("incident_severity", "none")
-        account = r.get("account_type", "none")
-        interaction = r.get("safety_interaction", "none")
-
-        # Count incidents (firsthand only)
-        if account == "firsthand":
-            if severity == "mild":
-                n_mild += 1
-                incident_reviews.append(r)
-            elif severity == "moderate":
-                n_moderate += 1
-                incident_reviews.append(r)
-            elif severity == "severe":
-                n_severe += 1
-                incident_reviews.append(r)
-
-        # Count safety interactions
-        if interaction == "positive":
-            n_positive += 1
-        elif interaction == "negative":
-            n_negative += 1
-        elif interaction == "betrayal":
-            n_betrayal += 1
+    Concatenate every restaurant's review arrays into one flat SoA.
+
+    Restaurant i owns rows offsets[i]:offsets[i+1]; names and cuisine_mods are
+    aligned with the offsets.
+    """
+    names = list(all_judgments)
+    per_restaurant = [_reviews_to_soa(all_judgments[name].get("reviews", [])) for name in names]
+    lengths = [len(soa["idx"]) for soa in per_restaurant]
+
+    flat = {col: np.concatenate([soa[col] for soa in per_restaurant]) if per_restaurant
+            else np.zeros(0, dtype=dtype)
+            for col, dtype in SOA_DTYPES.items()}
+    flat["offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    flat["names"] = names
+    flat["cuisine_mods"] = np.array([
+        _restaurant_cuisine_modifier(all_judgments[name]) for name in names
+    ], dtype=np.float64)
+    return flat
+
+
+def _layer1_batch(flat: Dict[str, Any], k: Optional[int] = None) -> np.ndarray:
+    """Layer-1 matrix (n_restaurants, N_LAYER1) over reviews with idx < k."""
+    offsets = flat["offsets"]
+    cols = {col: flat[col] for col in SOA_DTYPES}
+    if k is not None:
+        keep = cols["idx"] < k
+        cols = _slice_soa(cols, keep)
+        offsets = np.concatenate(([0], np.cumsum(keep)))[offsets]
+
+    if HAS_NUMBA:
+        return _layer1_batch_kernel(cols["sev"], cols["acc"], cols["inter"],
+                                    cols["stars"], cols["useful"], cols["year"], offsets)
+    return np.array([
+        _layer1_numpy(_slice_soa(cols, slice(start, end)))
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]).reshape(-1, N_LAYER1)
+
+
+def _layer1_prefix(soa: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Prefix sums of the Layer-1 aggregates, for answering many K cuts at once.
+
+    Expects idx-sorted arrays (as from _get_soa); row i of 'cum' holds the
+    Layer-1 counts and weight over the first i+1 reviews. The max incident
+    year is not additive, so it gets a running max instead (0 until the
+    first incident).
+    """
+    sev, inter, year = soa["sev"], soa["inter"], soa["year"]
+    firsthand = soa["acc"] == ACC_FIRSTHAND
+    incident = firsthand & (sev != SEV_NONE)
+
+    contrib = np.zeros((len(sev), N_LAYER1), dtype=np.float64)
+    contrib[:, L1_N_REVIEWS] = 1
+    contrib[:, L1_N_MILD] = firsthand & (sev == SEV_MILD)
+    contrib[:, L1_N_MODERATE] = firsthand & (sev == SEV_MODERATE)
+    contrib[:, L1_N_SEVERE] = firsthand & (sev == SEV_SEVERE)
+    contrib[:, L1_N_POSITIVE] = inter == INTER_POSITIVE
+    contrib[:, L1_N_NEGATIVE] = inter == INTER_NEGATIVE
+    contrib[:, L1_N_BETRAYAL] = inter == INTER_BETRAYAL
+    contrib[:, L1_N_RECENT] = incident & (year >= RECENT_YEAR)
+    contrib[:, L1_N_OLD] = incident & (year < RECENT_YEAR)
+    contrib[incident, L1_TOTAL_WEIGHT] = ((5 - soa["stars"][incident])
+                                          + np.log1p(soa["useful"][incident]))
+
+    return {
+        "idx": soa["idx"],
+        "cum": np.cumsum(contrib, axis=0),
+        "max_year": np.maximum.accumulate(np.where(incident, year, 0)),
+    }
+
+
+def _layer1_at_k(prefix: Dict[str, np.ndarray], k: Optional[int]) -> np.ndarray:
+    """Layer-1 vector over reviews with idx < k (all reviews if k is None)."""
+    idx = prefix["idx"]
+    cut = len(idx) if k is None else int(np.searchsorted(idx, k, side="left"))
+    if not cut:
+        return np.zeros(N_LAYER1, dtype=np.float64)
+    l1 = prefix["cum"][cut - 1].copy()
+    l1[L1_MAX_YEAR] = prefix["max_year"][cut - 1]
+    return l1
+
+
+def _unpack_layer1(l1: np.ndarray):
+    """Layer-1 vector -> Python ints (counts, year) and float (total weight)."""
+    counts = [int(v) for v in l1[:L1_TOTAL_WEIGHT]]
+    return (*counts, float(l1[L1_TOTAL_WEIGHT]))
+
+
+# Verdict labels in score order
+VERDICTS = ("Low Risk", "High Risk", "Critical Risk")
+
+
+def _verdict(final_risk_score: float) -> str:
+    """Verdict label for an unrounded final risk score."""
+    if final_risk_score < 4.0:
+        return "Low Risk"
+    elif final_risk_score < 8.0:
+        return "High Risk"
+    return "Critical Risk"
+
+
+def _gt_v1_fields(l1: np.ndarray, cuisine_modifier: float) -> Dict[str, Any]:
+    """Layer 2/3 of the V1 formula from precomputed Layer-1 aggregates, as G1GroundTruth fields."""
+    (n_allergy_reviews, n_mild, n_moderate, n_severe,
+     n_positive, n_negative, n_betrayal,
+     max_year, _n_recent, _n_old, total_weight) = _unpack_layer1(l1)
 
     n_total_incidents = n_mild + n_moderate + n_severe
 
@@ -210,38 +490,18 @@ def compute_gt_from_data(data: Dict) -> G1GroundTruth:
     # Step 2.4: Safety Credit
     safety_credit = (n_positive * 1.0) - (n_negative * 0.5) - (n_betrayal * 5.0)
 
-    # Step 2.5: Cuisine Modifier
-    cuisine_modifier = get_cuisine_modifier(categories)
-
     # Step 2.6: Review Density & Confidence
     review_density = min(1.0, n_allergy_reviews / 10.0)
     confidence_penalty = 1.0 - (0.3 * (1 - review_density))
 
     # Step 2.7: Recency
-    if incident_reviews:
-        years = []
-        for r in incident_reviews:
-            date_str = r.get("date", "2020-01-01")
-            try:
-                year = int(date_str[:4])
-            except (ValueError, TypeError):
-                year = 2020
-            years.append(year)
-        most_recent_incident_year = max(years)
-    else:
-        most_recent_incident_year = 2020  # Default old
+    most_recent_incident_year = max_year if n_total_incidents else DEFAULT_YEAR
 
     incident_age = 2025 - most_recent_incident_year
     recency_decay = max(0.3, 1.0 - (incident_age * 0.15))
 
     # Step 2.8: Credibility Factor
-    if incident_reviews:
-        total_weight = 0.0
-        for r in incident_reviews:
-            stars = r.get("stars", 3)
-            useful = r.get("useful", 0)
-            weight = (5 - stars) + math.log(useful + 1)
-            total_weight += weight
+    if n_total_incidents:
         credibility_factor = total_weight / max(n_total_incidents, 1)
     else:
         total_weight = 0.0
@@ -262,15 +522,9 @@ def compute_gt_from_data(data: Dict) -> G1GroundTruth:
 
     final_risk_score = max(0.0, min(20.0, raw_risk))
 
-    # Verdict
-    if final_risk_score < 4.0:
-        verdict = "Low Risk"
-    elif final_risk_score < 8.0:
-        verdict = "High Risk"
-    else:
-        verdict = "Critical Risk"
+    verdict = _verdict(final_risk_score)
 
-    return G1GroundTruth(
+    return dict(
         n_mild=n_mild,
         n_moderate=n_moderate,
         n_severe=n_severe,
@@ -298,58 +552,11 @@ def compute_gt_from_data(data: Dict) -> G1GroundTruth:
     )
 
 
-def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
-    """
-    Compute all GT primitives using V2 formula (harder).
-
-    V2 additions:
-    - Trust Score based on safety interactions
-    - Trust-adjusted severity weights
-    - Temporal trajectory classification (improving/stable/worsening)
-    - Cuisine silence penalty
-    - Modified final score formula with trust impact and positive credit
-
-    Args:
-        data: Restaurant judgment data with 'restaurant_meta' and 'reviews' keys
-
-    Returns:
-        G1GroundTruthV2 dataclass with all computed primitives
-    """
-    reviews = data.get("reviews", [])
-    categories = data.get("restaurant_meta", {}).get("categories", "")
-
-    # === LAYER 1: Count from per-review judgments ===
-    n_mild = n_moderate = n_severe = 0
-    n_positive = n_negative = n_betrayal = 0
-    n_allergy_reviews = 0
-    incident_reviews = []  # For credibility calculation
-
-    for r in reviews:
-        n_allergy_reviews += 1
-
-        severity = r.get("incident_severity", "none")
-        account = r.get("account_type", "none")
-        interaction = r.get("safety_interaction", "none")
-
-        # Count incidents (firsthand only)
-        if account == "firsthand":
-            if severity == "mild":
-                n_mild += 1
-                incident_reviews.append(r)
-            elif severity == "moderate":
-                n_moderate += 1
-                incident_reviews.append(r)
-            elif severity == "severe":
-                n_severe += 1
-                incident_reviews.append(r)
-
-        # Count safety interactions
-        if interaction == "positive":
-            n_positive += 1
-        elif interaction == "negative":
-            n_negative += 1
-        elif interaction == "betrayal":
-            n_betrayal += 1
+def _gt_v2_fields(l1: np.ndarray, cuisine_modifier: float) -> Dict[str, Any]:
+    """Layer 2/3 of the V2 formula from precomputed Layer-1 aggregates, as G1GroundTruthV2 fields."""
+    (n_allergy_reviews, n_mild, n_moderate, n_severe,
+     n_positive, n_negative, n_betrayal,
+     max_year, n_recent, n_old, total_weight) = _unpack_layer1(l1)
 
     n_total_incidents = n_mild + n_moderate + n_severe
 
@@ -370,21 +577,7 @@ def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
     adjusted_incident_score = (n_mild * mild_weight) + (n_moderate * moderate_weight) + (n_severe * severe_weight)
 
     # === LAYER 2: Temporal Trajectory (NEW in V2) ===
-    n_recent = 0  # incidents where year >= 2023
-    n_old = 0     # incidents where year < 2023
-
-    for r in incident_reviews:
-        date_str = r.get("date", "2020-01-01")
-        try:
-            year = int(date_str[:4])
-        except (ValueError, TypeError):
-            year = 2020
-        if year >= 2023:
-            n_recent += 1
-        else:
-            n_old += 1
-
-    # Calculate trajectory
+    # n_recent: incidents where year >= 2023, n_old: incidents where year < 2023
     if n_total_incidents > 0:
         recent_ratio = n_recent / n_total_incidents
     else:
@@ -402,8 +595,6 @@ def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
         trajectory_multiplier = 1.0
 
     # === LAYER 2: Cuisine with Silence Penalty (ENHANCED in V2) ===
-    cuisine_modifier = get_cuisine_modifier(categories)
-
     # Silence penalty: high-risk cuisine with no allergy discussion
     # If N_ALLERGY_REVIEWS == 0: SILENCE_PENALTY = CUISINE_MODIFIER × 0.5
     if n_allergy_reviews == 0:
@@ -414,30 +605,13 @@ def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
     cuisine_impact = (cuisine_modifier * 0.5) + silence_penalty
 
     # === LAYER 2: Recency Decay (same as V1) ===
-    if incident_reviews:
-        years = []
-        for r in incident_reviews:
-            date_str = r.get("date", "2020-01-01")
-            try:
-                year = int(date_str[:4])
-            except (ValueError, TypeError):
-                year = 2020
-            years.append(year)
-        most_recent_incident_year = max(years)
-    else:
-        most_recent_incident_year = 2020
+    most_recent_incident_year = max_year if n_total_incidents else DEFAULT_YEAR
 
     incident_age = 2025 - most_recent_incident_year
     recency_decay = max(0.3, 1.0 - (incident_age * 0.15))
 
     # === LAYER 2: Credibility Factor (same as V1) ===
-    if incident_reviews:
-        total_weight = 0.0
-        for r in incident_reviews:
-            stars = r.get("stars", 3)
-            useful = r.get("useful", 0)
-            weight = (5 - stars) + math.log(useful + 1)
-            total_weight += weight
+    if n_total_incidents:
         credibility_factor = total_weight / max(n_total_incidents, 1)
     else:
         total_weight = 0.0
@@ -460,15 +634,9 @@ def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
 
     final_risk_score = max(0.0, min(20.0, raw_risk))
 
-    # Verdict
-    if final_risk_score < 4.0:
-        verdict = "Low Risk"
-    elif final_risk_score < 8.0:
-        verdict = "High Risk"
-    else:
-        verdict = "Critical Risk"
+    verdict = _verdict(final_risk_score)
 
-    return G1GroundTruthV2(
+    return dict(
         n_mild=n_mild,
         n_moderate=n_moderate,
         n_severe=n_severe,
@@ -504,15 +672,172 @@ def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
     )
 
 
+def _gt_v1_from_layer1(l1: np.ndarray, cuisine_modifier: float) -> G1GroundTruth:
+    return G1GroundTruth(**_gt_v1_fields(l1, cuisine_modifier))
+
+
+def _gt_v2_from_layer1(l1: np.ndarray, cuisine_modifier: float) -> G1GroundTruthV2:
+    return G1GroundTruthV2(**_gt_v2_fields(l1, cuisine_modifier))
+
+
+def compute_gt_from_data(data: Dict) -> G1GroundTruth:
+    """
+    Compute all GT primitives from judgment data for one restaurant.
+    This is DETERMINISTIC - no LLM calls, just arithmetic.
+
+    Args:
+        data: Restaurant judgment data with 'restaurant_meta' and 'reviews' keys
+
+    Returns:
+        G1GroundTruth dataclass with all computed primitives
+    """
+    soa = _reviews_to_soa([_normalize_review(dict(r)) for r in data.get("reviews", [])])
+    return _gt_v1_from_layer1(_layer1_from_soa(soa), _restaurant_cuisine_modifier(data))
+
+
+def compute_gt_from_data_v2(data: Dict) -> G1GroundTruthV2:
+    """
+    Compute all GT primitives using V2 formula (harder).
+
+    V2 additions:
+    - Trust Score based on safety interactions
+    - Trust-adjusted severity weights
+    - Temporal trajectory classification (improving/stable/worsening)
+    - Cuisine silence penalty
+    - Modified final score formula with trust impact and positive credit
+
+    Args:
+        data: Restaurant judgment data with 'restaurant_meta' and 'reviews' keys
+
+    Returns:
+        G1GroundTruthV2 dataclass with all computed primitives
+    """
+    soa = _reviews_to_soa([_normalize_review(dict(r)) for r in data.get("reviews", [])])
+    return _gt_v2_from_layer1(_layer1_from_soa(soa), _restaurant_cuisine_modifier(data))
+
+
+@lru_cache(maxsize=1)
 def load_judgments() -> Dict[str, Dict]:
-    """Load all judgments from file."""
+    """
+    Load all judgments from file.
+
+    Parsed once per process and shared by every caller (including the cached
+    review arrays below) - treat the result as read-only.
+    """
     if not JUDGMENTS_FILE.exists():
         raise FileNotFoundError(f"Judgments file not found: {JUDGMENTS_FILE}")
 
-    with open(JUDGMENTS_FILE, 'r') as f:
-        data = json.load(f)
+    if HAS_ORJSON:
+        # Parse straight from a read-only mapping of the file - no bytes copy
+        with open(JUDGMENTS_FILE, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                data = orjson.loads(view)
+    else:
+        with open(JUDGMENTS_FILE, 'r') as f:
+            data = json.load(f)
+
+    judgments = data.get("judgments", {})
+
+    # Normalize reviews and parse years / cuisine modifiers once here rather
+    # than on every GT computation - all are invariant across K and version
+    for restaurant in judgments.values():
+        restaurant["_cuisine_modifier"] = get_cuisine_modifier(
+            restaurant.get("restaurant_meta", {}).get("categories", ""))
+        for r in restaurant.get("reviews", []):
+            _normalize_review(r)
 
-    return data.get("judgments", {})
+    return judgments
+
+
+@lru_cache(maxsize=None)
+def _get_soa(restaurant_name: str) -> Dict[str, np.ndarray]:
+    """
+    Review arrays for one restaurant, built once per process.
+
+    Sorted by idx (stable, so already-ordered files keep their order) so a
+    K cut is a prefix slice found by binary search.
+    """
+    soa = _reviews_to_soa(load_judgments()[restaurant_name].get("reviews", []))
+    idx = soa["idx"]
+    if len(idx) > 1 and np.any(idx[1:] < idx[:-1]):
+        soa = _slice_soa(soa, np.argsort(idx, kind="stable"))
+    return soa
+
+
+@lru_cache(maxsize=None)
+def _get_prefix(restaurant_name: str) -> Dict[str, np.ndarray]:
+    """Layer-1 prefix sums for one restaurant, built once per process."""
+    return _layer1_prefix(_get_soa(restaurant_name))
+
+
+@lru_cache(maxsize=1)
+def _get_flat_soa() -> Dict[str, Any]:
+    """
+    Flat review arrays for all restaurants, built once per process.
+
+    Reused across runs through SOA_CACHE_FILE, so a warm start skips the JSON
+    parse entirely; the cache is rebuilt whenever judgments.json or the
+    encoding it was built with (_soa_schema_hash) changes.
+    """
+    if not JUDGMENTS_FILE.exists():
+        raise FileNotFoundError(f"Judgments file not found: {JUDGMENTS_FILE}")
+    stat = JUDGMENTS_FILE.stat()
+    key = np.array([stat.st_mtime_ns, stat.st_size, _soa_schema_hash()], dtype=np.int64)
+
+    flat = _load_flat_soa_cache(key)
+    if flat is None:
+        flat = _build_flat_soa(load_judgments())
+        _save_flat_soa_cache(flat, key)
+    return flat
+
+
+def _soa_schema_hash() -> int:
+    """Hash of SOA_CACHE_VERSION and the constants the cached flat arrays are derived from."""
+    schema = (SOA_CACHE_VERSION, CUISINE_RISK_BASE, SEVERITY_CODES, ACCOUNT_CODES,
+              INTERACTION_CODES, REVIEW_DEFAULTS, DEFAULT_YEAR, SOA_DTYPES, CODE_SHAPE, N_CODES)
+    digest = hashlib.blake2b(repr(schema).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def _load_flat_soa_cache(key: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Flat arrays from SOA_CACHE_FILE, or None if missing, stale or unreadable."""
+    try:
+        with np.load(SOA_CACHE_FILE, allow_pickle=False) as cache:
+            if not np.array_equal(cache["key"], key):
+                return None
+            flat = {col: cache[col] for col in SOA_DTYPES}
+            flat["offsets"] = cache["offsets"]
+            flat["names"] = cache["names"].tolist()
+            flat["cuisine_mods"] = cache["cuisine_mods"]
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        # Missing, stale-format or truncated (e.g. by a crashed write) - rebuild
+        return None
+    return flat
+
+
+def _save_flat_soa_cache(flat: Dict[str, Any], key: np.ndarray):
+    """
+    Best-effort write of SOA_CACHE_FILE (a read-only data dir just skips caching).
+
+    Written to a temp file in the same directory and renamed into place, so an
+    interrupted or concurrent run never leaves a partial cache behind.
+    """
+    arrays = {col: flat[col] for col in SOA_DTYPES}
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=SOA_CACHE_FILE.parent, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, key=key, offsets=flat["offsets"], names=np.array(flat["names"], dtype=str),
+                     cuisine_mods=flat["cuisine_mods"], **arrays)
+        os.replace(tmp_path, SOA_CACHE_FILE)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
 
 def compute_gt_for_k(restaurant_name: str, k: int = None, version: str = None):
@@ -547,22 +872,54 @@ def compute_gt_for_k(restaurant_name: str, k: int = None, version: str = None):
 
     data = all_judgments[restaurant_name]
 
-    # Filter reviews by original index (reviews have 'idx' field from source dataset)
+    soa = _get_soa(restaurant_name)
+
+    # Filter reviews by original index (reviews have 'idx' field from source dataset);
+    # the arrays are idx-sorted, so reviews 0..K-1 are a prefix
     if k is not None:
-        filtered_reviews = [r for r in data.get("reviews", []) if r.get("idx", 0) < k]
-    else:
-        filtered_reviews = data.get("reviews", [])
+        soa = _slice_soa(soa, slice(0, int(np.searchsorted(soa["idx"], k, side="left"))))
 
-    filtered_data = {
-        "restaurant_meta": data.get("restaurant_meta", {}),
-        "reviews": filtered_reviews
-    }
+    l1 = _layer1_from_soa(soa)
+    cuisine_modifier = _restaurant_cuisine_modifier(data)
 
     # Compute GT using specified formula version
     if version == "v2":
-        return compute_gt_from_data_v2(filtered_data)
+        return _gt_v2_from_layer1(l1, cuisine_modifier)
     else:
-        return compute_gt_from_data(filtered_data)
+        return _gt_v1_from_layer1(l1, cuisine_modifier)
+
+
+def compute_gt_for_ks(restaurant_name: str, ks: List[Optional[int]], version: str = None) -> Dict:
+    """
+    Compute GT for one restaurant at several K values in a single pass.
+
+    Layer-1 aggregates are cumulative in K, so they are prefix-summed once and
+    each K reads them back with a binary search instead of re-scanning reviews.
+
+    Args:
+        restaurant_name: Name of the restaurant
+        ks: K values to evaluate (None means all reviews)
+        version: Formula version ("v1" or "v2"). If None, use DEFAULT_FORMULA_VERSION.
+
+    Returns:
+        Dict mapping each K to G1GroundTruth (v1) or G1GroundTruthV2 (v2)
+
+    Example:
+        sweep = compute_gt_for_ks("Vetri Cucina", [10, 25, 50, 100, 200, None], version="v2")
+    """
+    if version is None:
+        version = DEFAULT_FORMULA_VERSION
+
+    all_judgments = load_judgments()
+
+    if restaurant_name not in all_judgments:
+        raise ValueError(f"No judgments found for: {restaurant_name}")
+
+    prefix = _get_prefix(restaurant_name)
+    cuisine_modifier = _restaurant_cuisine_modifier(all_judgments[restaurant_name])
+    build = _gt_v2_from_layer1 if version == "v2" else _gt_v1_from_layer1
+
+    return {k: build(_layer1_at_k(prefix, k), cuisine_modifier) for k in ks}
 
 
 def compute_gt_from_judgments(restaurant_name: str, version: str = None):
@@ -606,13 +963,74 @@ def compute_all_gt(k: int = None, version: str = None) -> Dict[str, any]:
     if version is None:
         version = DEFAULT_FORMULA_VERSION
 
-    all_judgments = load_judgments()
-    result = {}
+    return compute_all_gt_versions(k=k, versions=(version,))[version]
+
+
+def compute_all_gt_versions(k: int = None, versions=("v1", "v2")) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute GT for all restaurants under several formula versions at once.
 
-    for name in all_judgments:
-        result[name] = compute_gt_for_k(name, k=k, version=version)
+    Layer-1 aggregates do not depend on the formula version, so they are
+    computed once and shared by every version's Layer-2/3 formulas.
 
-    return result
+    Args:
+        k: Number of reviews to consider per restaurant (0 to k-1).
+           If None, use all reviews.
+        versions: Formula versions to compute ("v1" and/or "v2")
+
+    Returns:
+        Dict mapping version to {restaurant name: GT}
+    """
+    flat = _get_flat_soa()
+    l1_all = _layer1_batch(flat, k)
+    rows = list(zip(flat["names"], l1_all, flat["cuisine_mods"].tolist()))
+
+    results = {}
+    for version in versions:
+        build = _gt_v2_from_layer1 if version == "v2" else _gt_v1_from_layer1
+        results[version] = {name: build(l1, cuisine_modifier) for name, l1, cuisine_modifier in rows}
+    return results
+
+
+def compute_all_gt_as_dicts(k: int = None, version: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Like compute_all_gt, but returns each GT as a plain field dict.
+
+    Skips the dataclass round trip for callers that only serialize the result.
+    """
+    if version is None:
+        version = DEFAULT_FORMULA_VERSION
+
+    flat = _get_flat_soa()
+    l1_all = _layer1_batch(flat, k)
+    build = _gt_v2_fields if version == "v2" else _gt_v1_fields
+
+    return {
+        name: build(l1, cuisine_modifier)
+        for name, l1, cuisine_modifier in zip(flat["names"], l1_all, flat["cuisine_mods"].tolist())
+    }
+
+
+# Field names per GT class; every field is a flat scalar, so a shallow
+# getattr walk gives the same dict as dataclasses.asdict without its deep copy
+_GT_FIELDS = {cls: tuple(f.name for f in fields(cls)) for cls in (G1GroundTruth, G1GroundTruthV2)}
+
+
+def _gt_to_dict(gt) -> Dict[str, Any]:
+    """Plain dict of a G1GroundTruth / G1GroundTruthV2."""
+    return {name: getattr(gt, name) for name in _GT_FIELDS[type(gt)]}
+
+
+def verdict_distribution(verdicts) -> Dict[str, int]:
+    """
+    Count verdict labels in VERDICTS order.
+
+    Counts the stored labels rather than re-binning final_risk_score: that
+    field is rounded to 2 decimals, so a raw 7.996 ("High Risk") is stored
+    as 8.0 and would be binned as "Critical Risk".
+    """
+    counts = Counter(verdicts)
+    return {verdict: counts[verdict] for verdict in VERDICTS}
 
 
 def save_computed_gt(k: int = None, version: str = None):
@@ -626,7 +1044,7 @@ def save_computed_gt(k: int = None, version: str = None):
     if version is None:
         version = DEFAULT_FORMULA_VERSION
 
-    all_gt = compute_all_gt(k=k, version=version)
+    all_gt = compute_all_gt_as_dicts(k=k, version=version)
 
     output = {
         "task_id": "G1a",
@@ -636,16 +1054,10 @@ def save_computed_gt(k: int = None, version: str = None):
         "restaurants": {}
     }
 
-    # Collect verdict distribution
-    verdicts = {"Low Risk": 0, "High Risk": 0, "Critical Risk": 0}
-
-    for name, gt in all_gt.items():
-        output["restaurants"][name] = asdict(gt)
-        verdicts[gt.verdict] += 1
-
+    output["restaurants"] = all_gt
     output["summary"] = {
         "total_restaurants": len(all_gt),
-        "verdict_distribution": verdicts
+        "verdict_distribution": verdict_distribution(gt["verdict"] for gt in all_gt.values())
     }
 
     # Use different output file for different K values and versions
@@ -661,8 +1073,12 @@ def save_computed_gt(k: int = None, version: str = None):
         output_file = OUTPUT_FILE
 
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w') as f:
-        json.dump(output, f, indent=2)
+    if HAS_ORJSON:
+        output_file.write_bytes(orjson.dumps(
+            output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(output, f, indent=2)
 
     return output, output_file
 
@@ -678,16 +1094,14 @@ def print_gt(restaurant_name: str = None, k: int = None, version: str = None):
         print(f"\n{'='*60}")
         print(f"G1a Ground Truth ({version}): {restaurant_name} ({k_str})")
         print(f"{'='*60}")
-        for field, value in asdict(gt).items():
+        for field, value in _gt_to_dict(gt).items():
             print(f"  {field}: {value}")
     else:
         all_gt = compute_all_gt(k=k, version=version)
         k_str = f"K={k}" if k else "all reviews"
-        verdicts = {"Low Risk": 0, "High Risk": 0, "Critical Risk": 0}
         for name, gt in all_gt.items():
-            verdicts[gt.verdict] += 1
             print(f"{name}: {gt.verdict} (score={gt.final_risk_score})")
-        print(f"\nDistribution ({version}, {k_str}): {verdicts}")
+        print(f"\nDistribution ({version}, {k_str}): {verdict_distribution(gt.verdict for gt in all_gt.values())}")
 
 
 if __name__ == "__main__":
@@ -709,13 +1123,9 @@ if __name__ == "__main__":
         print("COMPARING V1 vs V2 FORMULA DISTRIBUTIONS")
         print("="*60)
 
-        for version in ["v1", "v2"]:
-            all_gt = compute_all_gt(k=args.k, version=version)
-            verdicts = {"Low Risk": 0, "High Risk": 0, "Critical Risk": 0}
-            scores = []
-            for gt in all_gt.values():
-                verdicts[gt.verdict] += 1
-                scores.append(gt.final_risk_score)
+        for version, all_gt in compute_all_gt_versions(k=args.k).items():
+            scores = [gt.final_risk_score for gt in all_gt.values()]
+            verdicts = verdict_distribution(gt.verdict for gt in all_gt.values())
 
             k_str = f"K={args.k}" if args.k else "all"
             avg_score = sum(scores) / len(scores) if scores else 0
@@ -41,7 +41,7 @@ from .tools import (
     tool_read, tool_lwt_list, tool_lwt_get,
     tool_lwt_set, tool_lwt_set_prompt, tool_lwt_delete, tool_lwt_insert,
     tool_lwt_insert_prompt, tool_review_length, tool_update_step, tool_insert_step,
-    tool_get_review_lengths, tool_keyword_search, tool_get_review_snippet,
+    tool_get_review_lengths, tool_keyword_search_batch, tool_get_review_snippet,
     tool_list_items, tool_check_item, tool_drop_item, tool_add_step
 )
 from .phase2_hierarchical import run_hierarchical_phase2
@@ -795,10 +795,16 @@ class AdaptiveNetworkOfThought(BaseMethod):
                 result = tool_get_review_lengths(int(match.group(1)), query)
                 action_results.append((f"get_review_lengths({match.group(1)})", result))
 
-            # keyword_search(N, "word")
-            for match in re.finditer(r'keyword_search\((\d+),\s*"([^"]+)"\)', response):
-                result = tool_keyword_search(int(match.group(1)), match.group(2), query)
-                action_results.append((f"keyword_search({match.group(1)}, \"{match.group(2)}\")", result))
+            # keyword_search(N, "word") - an item's keywords share one scan of its reviews
+            searches = [match.groups() for match in re.finditer(r'keyword_search\((\d+),\s*"([^"]+)"\)', response)]
+            item_keywords = {}
+            for item_num, keyword in searches:
+                item_keywords.setdefault(int(item_num), []).append(keyword)
+            search_results = {item_num: tool_keyword_search_batch(item_num, keywords, query)
+                              for item_num, keywords in item_keywords.items()}
+            for item_num, keyword in searches:
+                result = search_results[int(item_num)][keyword]
+                action_results.append((f"keyword_search({item_num}, \"{keyword}\")", result))
 
             # done()
             if "done()" in response.lower():
@@ -7,12 +7,16 @@ import json
 import ast
 import time
 import asyncio
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from llm import call_llm, call_llm_async
 
 DEBUG = os.environ.get("KNOT_DEBUG", "0") == "1"
 LOG_ENABLED = os.environ.get("KNOT_LOG", "0") == "1"
+MAX_STEP_WORKERS = 8  # Threads per layer in the sequential-API execute_script
 
 # Logging data store
 _log_data = None
@@ -266,11 +270,57 @@ Requirements:
 
 SYSTEM_PROMPT = "You follow instructions precisely. Output only what is requested."
 
+# Script patterns, compiled once (substitution runs for every step of every item)
+VAR_PATTERN = re.compile(r'\{\((\w+)\)\}((?:\[[^\]]+\])*)')  # {(var)}[key][index]
+ACCESSOR_PATTERN = re.compile(r'\[([^\]]+)\]')
+STEP_INDEX_PATTERN = re.compile(r'\((\d+)\)\s*=\s*LLM')
+STEP_INSTR_PATTERN = re.compile(r'LLM\(["\'](.+?)["\']\)', re.DOTALL)
+DEPENDENCY_PATTERN = re.compile(r'\{\((\d+)\)\}')
+FINAL_ANSWER_PATTERN = re.compile(r'(?:^|[:\s])(-1|0|1)(?:\s|$|\.)')
+
+
+def json_prefix(obj, limit: int) -> str:
+    """json.dumps(obj)[:limit], encoding only as much of obj as the prefix needs."""
+    chunks = []
+    size = 0
+    for chunk in json.JSONEncoder().iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(chunks)[:limit]
+
+
+def parse_literal(text: str):
+    """Parse step output as a literal: JSON fast path for objects/arrays, else ast.literal_eval.
+
+    Raises like ast.literal_eval when the text is not a literal.
+    """
+    if text.lstrip()[:1] in ('{', '['):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass  # Python-only syntax (single quotes, tuples, True/None)
+    return ast.literal_eval(text)
+
+
+@lru_cache(maxsize=512)
+def parse_accessors(accessors: str):
+    """Parse "[key][0]..." into ((key, int index or None), ...), once per distinct string.
+
+    Returns None if a key is digit-like but not an int (e.g. "²"); such a
+    chain always resolves to ''.
+    """
+    parsed = []
+    for acc in ACCESSOR_PATTERN.findall(accessors):
+        if acc.isdigit() and not acc.isdecimal():
+            return None
+        parsed.append((acc, int(acc) if acc.isdigit() else None))
+    return tuple(parsed)
+
 
 def substitute_variables(instruction: str, query, context: str, cache: dict) -> str:
     """Substitute {(var)}[key][index] patterns with actual values."""
-    pattern = r'\{\((\w+)\)\}((?:\[[^\]]+\])*)'
-
     def _sub(match):
         var = match.group(1)
         accessors = match.group(2) or ''
@@ -286,19 +336,21 @@ def substitute_variables(instruction: str, query, context: str, cache: dict) ->
         # Try to parse string as literal if needed
         if isinstance(val, str) and accessors:
             try:
-                parsed = ast.literal_eval(val)
+                parsed = parse_literal(val)
                 if isinstance(parsed, (dict, list, tuple)):
                     val = parsed
             except:
                 pass
 
         # Apply accessors [key] or [index]
-        for acc in re.findall(r'\[([^\]]+)\]', accessors):
+        path = parse_accessors(accessors)
+        if path is None:
+            val = ''
+        for acc, idx in path or ():
             try:
                 if isinstance(val, dict):
-                    val = val.get(acc, val.get(int(acc)) if acc.isdigit() else '')
-                elif isinstance(val, (list, tuple)) and acc.isdigit():
-                    idx = int(acc)
+                    val = val.get(acc, val.get(idx) if idx is not None else '')
+                elif isinstance(val, (list, tuple)) and idx is not None:
                     val = val[idx] if 0 <= idx < len(val) else ''
                 else:
                     val = ''
@@ -310,7 +362,7 @@ def substitute_variables(instruction: str, query, context: str, cache: dict) ->
             return json.dumps(val)
         return str(val)
 
-    return re.sub(pattern, _sub, instruction)
+    return VAR_PATTERN.sub(_sub, instruction)
 
 
 def parse_script(script: str) -> list:
@@ -319,8 +371,8 @@ def parse_script(script: str) -> list:
     for line in script.split('\n'):
         if '=LLM(' not in line:
             continue
-        idx_match = re.search(r'\((\d+)\)\s*=\s*LLM', line)
-        instr_match = re.search(r'LLM\(["\'](.+?)["\']\)', line, re.DOTALL)
+        idx_match = STEP_INDEX_PATTERN.search(line)
+        instr_match = STEP_INSTR_PATTERN.search(line)
         if idx_match and instr_match:
             steps.append((idx_match.group(1), instr_match.group(1)))
     return steps
@@ -329,7 +381,7 @@ def parse_script(script: str) -> list:
 def extract_dependencies(instruction: str) -> set:
     """Extract step indices referenced in instruction (e.g., {(0)}, {(1)})."""
     # Find all {(N)} patterns, excluding {(input)} and {(context)}
-    matches = re.findall(r'\{\((\d+)\)\}', instruction)
+    matches = DEPENDENCY_PATTERN.findall(instruction)
     return set(matches)
 
 
@@ -380,7 +432,7 @@ def parse_final_answer(output: str) -> int:
     if output in ["-1", "0", "1"]:
         return int(output)
 
-    match = re.search(r'(?:^|[:\s])(-1|0|1)(?:\s|$|\.)', output)
+    match = FINAL_ANSWER_PATTERN.search(output)
     if match:
         return int(match.group(1))
 
@@ -451,7 +503,7 @@ Example with verification:
              "command", "ignore", "manipulation", "filter", "authenticity"])
 
         if self.mode == "dict":
-            goal = f"Input (dict with keys: item_name, city, neighborhood, price_range, cuisine, item_data): {json.dumps(query)[:500]}...\nContext: {context}"
+            goal = f"Input (dict with keys: item_name, city, neighborhood, price_range, cuisine, item_data): {json_prefix(query, 500)}...\nContext: {context}"
             example = TASK_EXAMPLE_DEFENSE if needs_defense else TASK_EXAMPLE_DICT
         else:
             goal = f"Input: {str(query)[:500]}...\nContext: {context}"
@@ -473,7 +525,12 @@ Example with verification:
         return script
 
     def execute_script(self, script: str, query, context: str) -> str:
-        """Execute script step by step."""
+        """Execute script layer by layer, running each layer's steps in threads.
+
+        Same schedule as execute_script_parallel, for callers that cannot use
+        asyncio.run() (already inside an event loop). Returns the output of the
+        script's last step, as running the steps in order would.
+        """
         self.cache = {}
         steps = parse_script(script)
 
@@ -486,8 +543,8 @@ Example with verification:
             log_execution_step("fallback", "direct answer", fallback, output, duration_sec)
             return output
 
-        final = ""
-        for idx, instr in steps:
+        def run_step(step):
+            idx, instr = step
             filled = substitute_variables(instr, query, context, self.cache)
 
             if DEBUG:
@@ -505,16 +562,27 @@ Example with verification:
 
             # Log execution step
             log_execution_step(idx, instr, filled, output, duration_sec)
+            return idx, output
 
-            # Cache result
-            try:
-                self.cache[idx] = ast.literal_eval(output)
-            except:
-                self.cache[idx] = output
-
-            final = output
-            if DEBUG:
-                print(f"  -> {output[:100]}...")
+        final = ""
+        with ThreadPoolExecutor(max_workers=MAX_STEP_WORKERS) as pool:
+            for layer in build_execution_layers(steps):
+                # Steps in a layer don't reference each other, so the cache
+                # is only written once the whole layer has finished
+                results = list(pool.map(run_step, layer))
+
+                # Cache results
+                for step, (idx, output) in zip(layer, results):
+                    try:
+                        self.cache[idx] = parse_literal(output)
+                    except:
+                        self.cache[idx] = output
+
+                    # A trailing independent step can land in an early layer
+                    if step == steps[-1]:
+                        final = output
+                    if DEBUG:
+                        print(f"  -> {output[:100]}...")
 
         return final
 
@@ -567,7 +635,7 @@ Example with verification:
             # Cache results
             for idx, output in results:
                 try:
-                    self.cache[idx] = ast.literal_eval(output)
+                    self.cache[idx] = parse_literal(output)
                 except:
                     self.cache[idx] = output
                 final = output
@@ -613,9 +681,8 @@ Example with verification:
         return answer
 
 
-_executor = None
-_current_mode = None
-_current_approach = None
+# Executor per thread: execute_script resets self.cache, so threads must not share one
+_executor_local = threading.local()
 
 # Approach configuration
 APPROACH_CONFIG = {
@@ -776,26 +843,35 @@ Write an improved step-by-step plan. Keep it simple and focused."""
 class KnowledgeNetworkOfThoughtDivide(KnowledgeNetworkOfThought):
     """Divide and conquer planning: plan each aspect separately then combine."""
 
+    def __init__(self, mode="string"):
+        super().__init__(mode)
+        # Sub-plan prompts depend only on the context, so every item of a
+        # request shares one set: context -> {name: sub-plan}
+        self._subplan_cache = {}
+
     def generate_knowledge(self, query, context: str) -> str:
         """Generate knowledge by dividing planning into sub-tasks."""
         if self.mode == "dict":
-            goal = f"Input (dict): {json.dumps(query)[:300]}...\\nContext: {context}"
+            goal = f"Input (dict): {json_prefix(query, 300)}...\\nContext: {context}"
         else:
             goal = f"Input: {str(query)[:300]}...\\nContext: {context}"
 
-        # Divide: Plan each sub-task separately
-        subtasks = [
-            ("extract", f"How should I extract what the user specifically wants from: {context}? Output one brief step."),
-            ("find", f"How should I find relevant information in restaurant reviews for: {context}? Output one brief step."),
-            ("score", "How should I count or score positive vs negative evidence? Output one brief step."),
-            ("decide", "How should I make the final decision (-1, 0, or 1)? Output one brief step."),
-        ]
-
-        subplans = {}
-        for name, prompt in subtasks:
-            subplans[name] = call_llm(prompt, system=SYSTEM_PROMPT, role="planner")
-            if DEBUG:
-                print(f"SUBPLAN {name}: {subplans[name][:100]}...")
+        # Divide: Plan each sub-task separately (once per context)
+        subplans = self._subplan_cache.get(context)
+        if subplans is None:
+            subtasks = [
+                ("extract", f"How should I extract what the user specifically wants from: {context}? Output one brief step."),
+                ("find", f"How should I find relevant information in restaurant reviews for: {context}? Output one brief step."),
+                ("score", "How should I count or score positive vs negative evidence? Output one brief step."),
+                ("decide", "How should I make the final decision (-1, 0, or 1)? Output one brief step."),
+            ]
+
+            subplans = {}
+            for name, prompt in subtasks:
+                subplans[name] = call_llm(prompt, system=SYSTEM_PROMPT, role="planner")
+                if DEBUG:
+                    print(f"SUBPLAN {name}: {subplans[name][:100]}...")
+            self._subplan_cache[context] = subplans
 
         # Conquer: Combine sub-plans
         combine_prompt = f"""Combine these steps into one coherent plan for restaurant recommendation:
@@ -823,26 +899,26 @@ Write a unified step-by-step plan using Step0, Step1, Step2, etc. Keep it simple
 def create_method(mode="string", approach="base"):
     """Factory to create method with specific mode and approach."""
     def method(query, context: str) -> int:
-        global _executor, _current_mode, _current_approach
+        state = _executor_local
 
-        # Recreate executor if mode or approach changed
-        if _executor is None or _current_mode != mode or _current_approach != approach:
+        # Recreate this thread's executor if missing or mode or approach changed
+        if getattr(state, 'executor', None) is None or state.mode != mode or state.approach != approach:
             config = APPROACH_CONFIG.get(approach, {})
 
             if approach == "voting":
-                _executor = KnowledgeNetworkOfThoughtVoting(mode=mode, **config)
+                state.executor = KnowledgeNetworkOfThoughtVoting(mode=mode, **config)
             elif approach == "iterative":
-                _executor = KnowledgeNetworkOfThoughtIterative(mode=mode, **config)
+                state.executor = KnowledgeNetworkOfThoughtIterative(mode=mode, **config)
             elif approach == "divide":
-                _executor = KnowledgeNetworkOfThoughtDivide(mode=mode)
+                state.executor = KnowledgeNetworkOfThoughtDivide(mode=mode)
             else:
-                _executor = KnowledgeNetworkOfThought(mode=mode)
+                state.executor = KnowledgeNetworkOfThought(mode=mode)
 
-            _current_mode = mode
-            _current_approach = approach
+            state.mode = mode
+            state.approach = approach
 
         try:
-            return _executor.solve(query, context)
+            return state.executor.solve(query, context)
         except Exception as e:
             if DEBUG:
                 print(f"Error: {e}")
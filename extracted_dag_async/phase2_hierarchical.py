@@ -16,7 +16,8 @@ Architecture:
 import re
 import json
 import asyncio
-from typing import Dict, List, Tuple, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any, Optional, Callable
 from dataclasses import dataclass, field
 
 from utils.llm import call_llm_async
@@ -28,29 +29,131 @@ from utils.llm import call_llm_async
 
 MAX_DEPTH = 3  # 0=main, 1=item, 2=review
 MAX_ITERATIONS = {0: 25, 1: 12, 2: 6}
+LLM_CONCURRENCY = {0: 1, 1: 16, 2: 32}  # In-flight LLM calls per depth (reviews are cheapest)
 SCOPE_NAMES = {0: "main", 1: "item", 2: "review"}
+FRIEND_TAGS = ("", " [1-hop]", " [2-hop]")  # Indexed by friend hop (0 = not a friend)
+FRIEND_STATUS = ("NOT_FRIEND", "1-HOP friend", "2-HOP friend")
+
+# Tool-call patterns, compiled once for every LLM response
+CHECK_HARD_PATTERN = re.compile(r'check_hard\((\d+)\)')
+SKIP_ID_PATTERN = re.compile(r'skip\((\d+),\s*"([^"]+)"\)')
+CHECK_DATE_PATTERN = re.compile(r'check_date\((\d+),\s*"([^"]+)"\)')
+CHECK_STARS_PATTERN = re.compile(r'check_stars\((\d+),\s*"([^"]+)"\)')
+CHECK_FRIEND_PATTERN = re.compile(r'check_friend\((\d+)\)')
+SEARCH_PATTERN = re.compile(r'search\("([^"]+)"\)')
+SPAWN_PATTERN = re.compile(r'spawn\((\d+)\)')
+SKIP_REASON_PATTERN = re.compile(r'skip\("([^"]+)"\)')
+
+# Start of any tool call; one scan over the response locates every call site
+TOOL_START_PATTERN = re.compile(r'(check_hard|check_date|check_stars|check_friend|search|spawn|emit|skip)\(')
+
+ToolArgs = Tuple[str, ...]
+ToolParser = Callable[[str, int], Optional[Tuple[int, ToolArgs]]]
+
+
+def regex_parser(pattern: re.Pattern) -> ToolParser:
+    """Wrap a tool-call pattern as a parser: (text, pos) -> (end, groups) or None."""
+    def parse(text: str, pos: int) -> Optional[Tuple[int, ToolArgs]]:
+        m = pattern.match(text, pos)
+        return (m.end(), m.groups()) if m else None
+    return parse
+
+
+def parse_emit(text: str, pos: int) -> Optional[Tuple[int, ToolArgs]]:
+    """Parse emit("id", "body") at pos. Returns (end, (id, raw body)) or None.
+
+    Accepts exactly what r'emit\\("([^"]+)",\\s*"((?:[^"\\\\]|\\\\.)*)"\\)' with
+    DOTALL would, but in linear time: an unterminated body is scanned once
+    instead of being backtracked over.
+    """
+    if not text.startswith('emit("', pos):
+        return None
+    id_start = pos + 6
+    id_end = text.find('"', id_start)
+    if id_end <= id_start:  # No closing quote, or empty id
+        return None
+    i = id_end + 1
+    if not text.startswith(',', i):
+        return None
+    i += 1
+    n = len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    if not text.startswith('"', i):
+        return None
+    body_start = i = i + 1
+    while True:
+        quote = text.find('"', i)
+        if quote < 0:
+            return None
+        # A quote is escaped iff an odd run of backslashes precedes it
+        k = quote
+        while k > body_start and text[k - 1] == '\\':
+            k -= 1
+        if (quote - k) % 2 == 0:
+            break
+        i = quote + 1
+    if not text.startswith(')', quote + 1):
+        return None
+    return quote + 2, (text[id_start:id_end], text[body_start:quote])
+
+
+# Tool verbs understood at each depth, with the parser for their arguments
+SPAWN = regex_parser(SPAWN_PATTERN)
+SKIP_REASON = regex_parser(SKIP_REASON_PATTERN)
+DEPTH_TOOL_PARSERS = {
+    0: {'check_hard': regex_parser(CHECK_HARD_PATTERN), 'skip': regex_parser(SKIP_ID_PATTERN),
+        'spawn': SPAWN, 'emit': parse_emit},
+    1: {'check_date': regex_parser(CHECK_DATE_PATTERN), 'check_stars': regex_parser(CHECK_STARS_PATTERN),
+        'check_friend': regex_parser(CHECK_FRIEND_PATTERN), 'skip': SKIP_REASON,
+        'spawn': SPAWN, 'emit': parse_emit},
+    2: {'search': regex_parser(SEARCH_PATTERN), 'skip': SKIP_REASON,
+        'spawn': SPAWN, 'emit': parse_emit},
+}
+
+
+def scan_tool_calls(response: str, parsers: Dict[str, ToolParser]) -> Dict[str, List[ToolArgs]]:
+    """Find all tool calls in one pass. Returns verb -> argument tuples in response order.
+
+    Per verb, the calls are the same as a finditer over that verb's pattern
+    would give: a call starting inside the previous call of that verb is
+    not counted.
+    """
+    calls = {verb: [] for verb in parsers}
+    ends = {}
+    for start in TOOL_START_PATTERN.finditer(response):
+        verb = start.group(1)
+        parse = parsers.get(verb)
+        if parse is None or start.start() < ends.get(verb, 0):
+            continue
+        parsed = parse(response, start.start())
+        if parsed:
+            ends[verb], args = parsed
+            calls[verb].append(args)
+    return calls
 
 
 # =============================================================================
 # Shared State
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class SharedState:
-    """Thread-safe shared state for step collection."""
+    """Shared state for step collection.
+
+    All agents run as coroutines on one event loop and neither method awaits,
+    so no lock is needed: each call completes before another agent runs.
+    """
     steps: List[Tuple[str, str]] = field(default_factory=list)
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
-    async def add_step(self, step_id: str, prompt: str):
-        async with self._lock:
-            self.steps.append((step_id, prompt))
+    def add_step(self, step_id: str, prompt: str):
+        self.steps.append((step_id, prompt))
 
-    async def get_steps(self) -> List[Tuple[str, str]]:
-        async with self._lock:
-            return list(self.steps)
+    def get_steps(self) -> List[Tuple[str, str]]:
+        return list(self.steps)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentContext:
     """Shared context for agent hierarchy."""
     lwt_seed: str
@@ -63,6 +166,16 @@ class AgentContext:
     friends_2hop: set = field(default_factory=set)  # Friends of friends
     debug_callback: Optional[callable] = None
     log_callback: Optional[callable] = None
+    cond_class: dict = field(init=False)  # classify_conditions(conditions), shared by all agents
+    friend_hop: Dict[str, int] = field(init=False)  # user_id -> 1 or 2 (1-hop wins)
+    llm_sems: Dict[int, asyncio.Semaphore] = field(init=False)  # Per-depth LLM call limits
+    review_prompt_tail: str = field(init=False)  # Same for every review agent
+
+    def __post_init__(self):
+        self.cond_class = classify_conditions(self.conditions)
+        self.friend_hop = {**dict.fromkeys(self.friends_2hop, 2), **dict.fromkeys(self.friends_1hop, 1)}
+        self.llm_sems = {depth: asyncio.Semaphore(n) for depth, n in LLM_CONCURRENCY.items()}
+        self.review_prompt_tail = get_review_prompt_tail(self.cond_class)
 
 
 # =============================================================================
@@ -101,21 +214,60 @@ def classify_conditions(conditions: List[dict]) -> dict:
     return result
 
 
+@lru_cache(maxsize=None)
+def split_path(path: str) -> Tuple[str, ...]:
+    """Split an attribute path like 'attributes.Ambience[romantic]' into its keys.
+
+    Cached: the same condition paths recur for every main agent and request.
+    """
+    return tuple(p for p in path.replace('[', '.').replace(']', '').split('.') if p)
+
+
+def walk_path(data: dict, parts: Tuple[str, ...]) -> Any:
+    """Resolve pre-split path keys in nested dicts/lists. None if any step is missing."""
+    val = data
+    for part in parts:
+        if isinstance(val, dict):
+            val = val.get(part)
+        elif isinstance(val, list) and part.isdigit():
+            idx = int(part)
+            val = val[idx] if 0 <= idx < len(val) else None
+        else:
+            return None
+        if val is None:
+            return None
+    return val
+
+
+def make_matcher(expected: Any) -> Callable[[Any], bool]:
+    """Comparator for a hard condition's expected value, chosen once per condition.
+
+    Booleans compare by equality; anything else ('true', 'none', 'casual', ...)
+    compares case-insensitively as a string. Missing (None) actuals never
+    reach the matcher: they always fail.
+    """
+    if isinstance(expected, bool):
+        return lambda actual: actual == expected
+    expected_lower = str(expected).lower()
+    return lambda actual: str(actual).lower() == expected_lower
+
+
 # =============================================================================
 # System Prompts
 # =============================================================================
 
-def get_main_prompt(n_items: int, cond_class: dict, items_summary: str) -> str:
+def get_main_prompt(n_items: int, cond_class: dict, items_summary: str, failing_ids: List[str] = None) -> str:
     """Build main agent prompt with hard filtering capability."""
     hard_conds = "; ".join([f"{c.get('path', '')}={c.get('expected', c.get('description', ''))}"
                             for c in cond_class['hard']]) or "none"
     has_soft = bool(cond_class['soft_meta'] or cond_class['soft_text'] or cond_class['social'])
+    failing = f"Items already failing HARD (skip, no need to check_hard): {', '.join(failing_ids)}\n" if failing_ids else ""
 
     return f"""## Task: Rank {n_items} items. Check HARD conditions first to filter.
 
 HARD conditions: {hard_conds}
 Has SOFT conditions: {has_soft}
-
+{failing}
 Items summary:
 {items_summary}
 
@@ -153,7 +305,7 @@ Action: done()
 BEGIN:"""
 
 
-def get_item_prompt(item_id: str, item: dict, cond_class: dict, friends_1hop: set, friends_2hop: set) -> str:
+def get_item_prompt(item_id: str, item: dict, cond_class: dict, friend_hop: Dict[str, int]) -> str:
     """Build item agent prompt with metadata-first checking."""
     schema = {
         "name": item.get("name"),
@@ -169,12 +321,7 @@ def get_item_prompt(item_id: str, item: dict, cond_class: dict, friends_1hop: se
         stars = r.get('stars', '?')
         user = r.get('user', {})
         user_id = user.get('user_id', r.get('user_id', 'unknown'))
-        # Check friend status
-        friend_status = ""
-        if user_id in friends_1hop:
-            friend_status = " [1-hop]"
-        elif user_id in friends_2hop:
-            friend_status = " [2-hop]"
+        friend_status = FRIEND_TAGS[friend_hop.get(user_id, 0)]
         review_meta.append(f"R{i}: {date}, {stars}★, user={user_id[:8]}...{friend_status}")
 
     meta_str = "\n".join(review_meta) if review_meta else "no reviews"
@@ -235,15 +382,11 @@ Action: done()
 BEGIN:"""
 
 
-def get_review_prompt(review_id: str, parent_id: str, text: str, cond_class: dict) -> str:
-    """Build review agent prompt for text analysis."""
-    text_preview = text[:600] + "..." if len(text) > 600 else text
+def get_review_prompt_tail(cond_class: dict) -> str:
+    """Part of the review agent prompt shared by every review in a run."""
     text_conds = "; ".join([c.get('description', '') for c in cond_class['soft_text']]) or "general relevance"
 
-    return f"""## Review {review_id} for Item {parent_id}
-Text: {text_preview}
-
-## Looking for: {text_conds}
+    return f"""## Looking for: {text_conds}
 
 ## Your job: Search text for relevant content. Emit if found, skip if not.
 
@@ -263,6 +406,16 @@ Action: done()
 BEGIN:"""
 
 
+def get_review_prompt(review_id: str, parent_id: str, text: str, prompt_tail: str) -> str:
+    """Build review agent prompt for text analysis."""
+    text_preview = text[:600] + "..." if len(text) > 600 else text
+
+    return f"""## Review {review_id} for Item {parent_id}
+Text: {text_preview}
+
+{prompt_tail}"""
+
+
 SYSTEM_PROMPTS = {
     0: """You filter items by HARD conditions, then spawn for SOFT evaluation.
 Use check_hard(N) before spawning. Skip items that fail hard conditions.""",
@@ -282,6 +435,15 @@ Search for keywords, assess sentiment, then emit or skip."""
 class ReActAgent:
     """Recursive ReAct agent with smart lazy evaluation."""
 
+    # One agent per spawned item/review, so keep instances small
+    __slots__ = (
+        'agent_id', 'depth', 'context', 'scope_data', 'parent_id', 'cond_class',
+        'sub_tasks', 'skipped', 'skip_reason', 'hard_results',
+        '_hard_cache', '_hard_conds', '_item_attrs',  # Depth 0
+        '_reviews', '_review_dates', '_review_years', '_review_stars', '_review_hops',  # Depth 1
+        '_text', '_text_lower',  # Depth 2
+    )
+
     def __init__(
         self,
         agent_id: str,
@@ -289,19 +451,48 @@ class ReActAgent:
         context: AgentContext,
         scope_data: Any,
         parent_id: str = "",
-        cond_class: dict = None,
     ):
         self.agent_id = agent_id
         self.depth = depth
         self.context = context
         self.scope_data = scope_data
         self.parent_id = parent_id
-        self.cond_class = cond_class or classify_conditions(context.conditions)
+        self.cond_class = context.cond_class
 
-        self.sub_tasks: Dict[str, asyncio.Task] = {}
+        self.sub_tasks: Optional[Dict[str, asyncio.Task]] = None  # Allocated on first spawn
         self.skipped = False
         self.skip_reason = ""
-        self.hard_results: Dict[str, bool] = {}  # Track hard check results
+        self.hard_results: Optional[Dict[str, bool]] = None  # Track hard check results (depth 0)
+
+        if depth == 0:
+            self.hard_results = {}
+            self._hard_cache: Dict[str, Tuple[bool, int, int, str]] = {}  # item_id -> check result
+            # Hard conditions as (path, expected, matcher) with paths split and
+            # comparators chosen once, and each item's actual values resolved
+            # once for all check_hard calls
+            self._hard_conds = []
+            for c in self.cond_class['hard']:
+                expected = c.get('expected', c.get('description', ''))
+                self._hard_conds.append((c.get('path', ''), expected, make_matcher(expected)))
+            hard_parts = [split_path(path) for path, _, _ in self._hard_conds]
+            self._item_attrs: Dict[str, tuple] = {
+                item_id: tuple(walk_path(item, parts) for parts in hard_parts)
+                for item_id, item in scope_data.items()
+            }
+        elif depth == 1:
+            # Review metadata as parallel lists, read by the check_* tools
+            self._reviews = scope_data.get('reviews', [])
+            self._review_dates = [r.get('date', '')[:10] for r in self._reviews]
+            self._review_years = [int(d[:4]) if len(d) >= 4 and d[:4].isdigit() else 0
+                                  for d in self._review_dates]
+            self._review_stars = [r.get('stars', 0) for r in self._reviews]
+            friend_hop = context.friend_hop
+            self._review_hops = [friend_hop.get(r.get('user', {}).get('user_id', r.get('user_id', '')), 0)
+                                 for r in self._reviews]
+        else:
+            # Review text and its lowercase copy, shared by every search()
+            self._text = scope_data.get('text', '')
+            self._text_lower = self._text.lower()
 
     def _debug(self, msg: str):
         if self.context.debug_callback:
@@ -315,23 +506,6 @@ class ReActAgent:
     def _can_spawn(self) -> bool:
         return self.depth < MAX_DEPTH - 1
 
-    def _get_nested(self, data: dict, path: str) -> Any:
-        parts = path.replace('[', '.').replace(']', '').split('.')
-        val = data
-        for part in parts:
-            if not part:
-                continue
-            if isinstance(val, dict):
-                val = val.get(part)
-            elif isinstance(val, list) and part.isdigit():
-                idx = int(part)
-                val = val[idx] if 0 <= idx < len(val) else None
-            else:
-                return None
-            if val is None:
-                return None
-        return val
-
     def _step_prefix(self) -> str:
         if self.depth == 1:
             return f"c{self.agent_id}_"
@@ -344,41 +518,25 @@ class ReActAgent:
     # -------------------------------------------------------------------------
 
     def _check_hard_conditions(self, item_id: str) -> Tuple[bool, int, int, str]:
-        """Check all hard conditions for an item. Returns (passed, matches, total, reason)."""
+        """Check hard conditions for an item. Returns (passed, matches, total, reason).
+
+        Stops at the first failing condition, so on a fail `matches` only
+        counts the conditions checked before it.
+        """
         item = self.scope_data.get(item_id, {})
         if not item:
             return False, 0, 0, "item not found"
 
-        matches = 0
-        total = len(self.cond_class['hard'])
-        fail_reason = ""
-
-        for cond in self.cond_class['hard']:
-            path = cond.get('path', '')
-            expected = cond.get('expected', cond.get('description', ''))
-
-            actual = self._get_nested(item, path)
-
-            # Check match
-            matched = False
-            if actual is not None:
-                # Handle various comparison types
-                if isinstance(expected, bool):
-                    matched = (actual == expected)
-                elif str(expected).lower() in ['true', 'false']:
-                    matched = (str(actual).lower() == str(expected).lower())
-                elif str(expected).lower() == 'none':
-                    matched = (actual is None or str(actual).lower() == 'none')
-                else:
-                    matched = (str(actual).lower() == str(expected).lower())
-
-            if matched:
-                matches += 1
-            elif not fail_reason:
-                fail_reason = f"{path}={actual}, need {expected}"
+        total = len(self._hard_conds)
+        checks = zip(self._hard_conds, self._item_attrs[item_id])
+        for matches, ((path, expected, matcher), actual) in enumerate(checks):
+            if actual is None or not matcher(actual):
+                return False, matches, total, f"{path}={actual}, need {expected}"
+        return True, total, total, ""
 
-        passed = (matches == total) if total > 0 else True
-        return passed, matches, total, fail_reason
+    def _precompute_hard_cache(self) -> Dict[str, Tuple[bool, int, int, str]]:
+        """Hard-condition results for every item, in one pass."""
+        return {item_id: self._check_hard_conditions(item_id) for item_id in self.scope_data}
 
     # -------------------------------------------------------------------------
     # Prompts
@@ -386,26 +544,24 @@ class ReActAgent:
 
     def _build_prompt(self) -> str:
         if self.depth == 0:
-            # Main agent - build items summary
+            # Main agent - build items summary (first 15 items only), showing
+            # key attributes relevant to hard conditions from the resolved values
+            short_paths = [path.split('.')[-1][:15] for path, _, _ in self._hard_conds[:3]]
+            item_ids = sorted(self.scope_data, key=int)
             items_summary = []
-            for item_id, item in sorted(self.scope_data.items(), key=lambda x: int(x[0])):
-                name = item.get('name', 'Unknown')[:25]
-                attrs = item.get('attributes', {})
-                # Show key attributes relevant to hard conditions
-                attr_preview = []
-                for cond in self.cond_class['hard'][:3]:
-                    path = cond.get('path', '')
-                    val = self._get_nested(item, path)
-                    if val is not None:
-                        short_path = path.split('.')[-1][:15]
-                        attr_preview.append(f"{short_path}={val}")
-                attr_str = ", ".join(attr_preview) if attr_preview else "..."
+            for item_id in item_ids[:15]:
+                name = self.scope_data[item_id].get('name', 'Unknown')[:25]
+                attr_str = ", ".join(f"{short_path}={val}"
+                                     for short_path, val in zip(short_paths, self._item_attrs[item_id])
+                                     if val is not None) or "..."
                 items_summary.append(f"{item_id}: {name} ({attr_str})")
 
+            failing_ids = [iid for iid in item_ids if not self._hard_cache.get(iid, (True,))[0]]
             return get_main_prompt(
                 len(self.scope_data),
                 self.cond_class,
-                "\n".join(items_summary[:15]) + ("\n..." if len(items_summary) > 15 else "")
+                "\n".join(items_summary) + ("\n..." if len(item_ids) > 15 else ""),
+                failing_ids
             )
 
         elif self.depth == 1:
@@ -413,17 +569,15 @@ class ReActAgent:
                 self.agent_id,
                 self.scope_data,
                 self.cond_class,
-                self.context.friends_1hop,
-                self.context.friends_2hop
+                self.context.friend_hop
             )
 
         else:
-            text = self.scope_data.get('text', '')
             return get_review_prompt(
                 self.agent_id,
                 self.parent_id,
-                text,
-                self.cond_class
+                self._text,
+                self.context.review_prompt_tail
             )
 
     # -------------------------------------------------------------------------
@@ -433,13 +587,15 @@ class ReActAgent:
     async def _exec_tools(self, response: str) -> Tuple[str, bool]:
         """Execute tools, return (observation, is_done)."""
         obs = []
+        response_lower = response.lower()
+        calls = scan_tool_calls(response, DEPTH_TOOL_PARSERS[self.depth])
 
         # === Depth 0: Main agent - hard checking ===
         if self.depth == 0:
             # check_hard(N)
-            for m in re.finditer(r'check_hard\((\d+)\)', response):
-                item_id = m.group(1)
-                passed, matches, total, reason = self._check_hard_conditions(item_id)
+            for item_id, in calls['check_hard']:
+                result = self._hard_cache.get(item_id)
+                passed, matches, total, reason = result or self._check_hard_conditions(item_id)
                 self.hard_results[item_id] = passed
                 if passed:
                     obs.append(f"check_hard({item_id}): PASS ({matches}/{total} hard conditions)")
@@ -447,29 +603,23 @@ class ReActAgent:
                     obs.append(f"check_hard({item_id}): FAIL ({reason})")
 
             # skip(N, reason)
-            for m in re.finditer(r'skip\((\d+),\s*"([^"]+)"\)', response):
-                item_id = m.group(1)
-                reason = m.group(2)
+            for item_id, reason in calls['skip']:
                 self._debug(f"skipped item {item_id}: {reason}")
                 obs.append(f"skip({item_id}): marked as filtered")
 
         # === Depth 1: Item agent - metadata checking ===
         if self.depth == 1:
-            reviews = self.scope_data.get('reviews', [])
+            reviews = self._reviews
 
             # check_date(R, ">=2020")
-            for m in re.finditer(r'check_date\((\d+),\s*"([^"]+)"\)', response):
-                r_idx = int(m.group(1))
-                date_cond = m.group(2)
+            for r_idx, date_cond in calls['check_date']:
+                r_idx = int(r_idx)
                 if r_idx < len(reviews):
-                    review = reviews[r_idx]
-                    date = review.get('date', '')[:10]
-                    # Simple year extraction
-                    year = int(date[:4]) if date and len(date) >= 4 else 0
+                    date = self._review_dates[r_idx]
                     # Parse condition like ">=2020"
                     if '>=' in date_cond:
                         threshold = int(date_cond.replace('>=', ''))
-                        passed = year >= threshold
+                        passed = self._review_years[r_idx] >= threshold
                     else:
                         passed = date_cond in date
                     status = "PASS" if passed else "FAIL"
@@ -478,12 +628,10 @@ class ReActAgent:
                     obs.append(f"check_date(R{r_idx}): invalid index")
 
             # check_stars(R, ">=4")
-            for m in re.finditer(r'check_stars\((\d+),\s*"([^"]+)"\)', response):
-                r_idx = int(m.group(1))
-                star_cond = m.group(2)
+            for r_idx, star_cond in calls['check_stars']:
+                r_idx = int(r_idx)
                 if r_idx < len(reviews):
-                    review = reviews[r_idx]
-                    stars = review.get('stars', 0)
+                    stars = self._review_stars[r_idx]
                     if '>=' in star_cond:
                         threshold = float(star_cond.replace('>=', ''))
                         passed = stars >= threshold
@@ -495,18 +643,11 @@ class ReActAgent:
                     obs.append(f"check_stars(R{r_idx}): invalid index")
 
             # check_friend(R)
-            for m in re.finditer(r'check_friend\((\d+)\)', response):
-                r_idx = int(m.group(1))
+            for r_idx, in calls['check_friend']:
+                r_idx = int(r_idx)
                 if r_idx < len(reviews):
-                    review = reviews[r_idx]
-                    user = review.get('user', {})
-                    user_id = user.get('user_id', review.get('user_id', ''))
-                    if user_id in self.context.friends_1hop:
-                        obs.append(f"check_friend(R{r_idx}): 1-HOP friend")
-                    elif user_id in self.context.friends_2hop:
-                        obs.append(f"check_friend(R{r_idx}): 2-HOP friend")
-                    else:
-                        obs.append(f"check_friend(R{r_idx}): NOT_FRIEND")
+                    status = FRIEND_STATUS[self._review_hops[r_idx]]
+                    obs.append(f"check_friend(R{r_idx}): {status}")
                 else:
                     obs.append(f"check_friend(R{r_idx}): invalid index")
 
@@ -514,19 +655,17 @@ class ReActAgent:
             if "list_reviews()" in response:
                 info = []
                 for i, r in enumerate(reviews[:10]):
-                    date = r.get('date', '')[:10]
-                    stars = r.get('stars', '?')
-                    info.append(f"R{i}:{date},{stars}★")
+                    info.append(f"R{i}:{self._review_dates[i]},{r.get('stars', '?')}★")
                 obs.append(f"reviews({len(reviews)}): {', '.join(info)}")
 
         # === Depth 2: Review agent - text search ===
         if self.depth == 2:
-            text = self.scope_data.get('text', '')
+            text = self._text
 
-            for m in re.finditer(r'search\("([^"]+)"\)', response):
-                kw = m.group(1).lower()
-                if kw in text.lower():
-                    idx = text.lower().index(kw)
+            for kw, in calls['search']:
+                kw = kw.lower()
+                idx = self._text_lower.find(kw)
+                if idx >= 0:
                     start = max(0, idx - 40)
                     end = min(len(text), idx + len(kw) + 80)
                     snippet = text[start:end]
@@ -535,12 +674,11 @@ class ReActAgent:
                     obs.append(f"search({kw}): NOT FOUND")
 
         # === Common: spawn ===
-        for m in re.finditer(r'spawn\((\d+)\)', response):
-            sub_id = m.group(1)
+        for sub_id, in calls['spawn']:
             if not self._can_spawn():
                 obs.append(f"spawn({sub_id}): ERROR max depth")
                 continue
-            if sub_id in self.sub_tasks:
+            if self.sub_tasks and sub_id in self.sub_tasks:
                 obs.append(f"spawn({sub_id}): already running")
                 continue
 
@@ -550,7 +688,7 @@ class ReActAgent:
                 sub_data = self.scope_data.get(sub_id)
             else:
                 # Item spawning review agent
-                revs = self.scope_data.get('reviews', [])
+                revs = self._reviews
                 idx = int(sub_id)
                 sub_data = revs[idx] if idx < len(revs) else None
 
@@ -558,10 +696,9 @@ class ReActAgent:
                 obs.append(f"spawn({sub_id}): invalid")
                 continue
 
-            sub = ReActAgent(
-                sub_id, self.depth + 1, self.context, sub_data,
-                self.agent_id, self.cond_class
-            )
+            sub = ReActAgent(sub_id, self.depth + 1, self.context, sub_data, self.agent_id)
+            if self.sub_tasks is None:
+                self.sub_tasks = {}
             self.sub_tasks[sub_id] = asyncio.create_task(sub.run())
             obs.append(f"spawn({sub_id}): started")
             self._debug(f"spawned {sub_id}")
@@ -597,24 +734,23 @@ class ReActAgent:
                 obs.append("wait_all: no pending agents")
 
         # === Common: emit ===
-        for m in re.finditer(r'emit\("([^"]+)",\s*"((?:[^"\\]|\\.)*)"\)', response, re.DOTALL):
-            step_id = m.group(1)
-            prompt = m.group(2).replace('\\"', '"').replace('\\n', '\n')
+        for step_id, prompt in calls['emit']:
+            prompt = prompt.replace('\\"', '"').replace('\\n', '\n')
             full_id = self._step_prefix() + step_id
-            await self.context.shared_state.add_step(full_id, prompt)
+            self.context.shared_state.add_step(full_id, prompt)
             obs.append(f"emit({step_id}): added as {full_id}")
             self._debug(f"emitted {full_id}")
 
         # === Common: skip ===
         if self.depth > 0:  # Item/review agent skip
-            for m in re.finditer(r'skip\("([^"]+)"\)', response):
+            for reason, in calls['skip']:
                 self.skipped = True
-                self.skip_reason = m.group(1)
+                self.skip_reason = reason
                 self._debug(f"skipped: {self.skip_reason}")
                 return f"skipped: {self.skip_reason}", True
 
         # === Common: done ===
-        if "done()" in response.lower():
+        if "done()" in response_lower:
             if self.sub_tasks:
                 self._debug(f"done() - waiting for {len(self.sub_tasks)} remaining")
                 await asyncio.gather(*self.sub_tasks.values(), return_exceptions=True)
@@ -638,18 +774,35 @@ class ReActAgent:
     async def run(self) -> bool:
         """Run agent. Returns True if not skipped."""
         max_iter = MAX_ITERATIONS.get(self.depth, 10)
-        conv = [self._build_prompt()]
+        if self.depth == 2 and not (self.cond_class['soft_text'] or self.cond_class['social']):
+            # Review agents exist only for TEXT and SOCIAL conditions (item agents
+            # spawn them for friends' reviews): with neither there is nothing to
+            # look for, so skip without an LLM round-trip
+            self.skipped = True
+            self.skip_reason = "no text or social conditions"
+            self._debug(f"skipped: {self.skip_reason}")
+            return False
+        if self.depth == 0:
+            # Hard conditions don't depend on the LLM: answer every check_hard
+            # from this table, and list guaranteed failures in the prompt so the
+            # LLM needn't spend iterations on them
+            self._hard_cache = self._precompute_hard_cache()
+        # The conversation so far; each turn is appended once instead of
+        # re-joining every earlier turn before each call
+        prompt = self._build_prompt()
 
         for i in range(max_iter):
             self._debug(f"iter {i+1}/{max_iter}")
 
-            prompt = "\n".join(conv)
-            resp = await call_llm_async(
-                prompt,
-                system=SYSTEM_PROMPTS.get(self.depth, ""),
-                role="planner",
-                context={"method": "anot", "phase": "2h", "depth": self.depth, "id": self.agent_id}
-            )
+            # Spawned agents fan out wide; the semaphore bounds how many of
+            # them talk to the LLM at once (held only for the call itself)
+            async with self.context.llm_sems[self.depth]:
+                resp = await call_llm_async(
+                    prompt,
+                    system=SYSTEM_PROMPTS.get(self.depth, ""),
+                    role="planner",
+                    context={"method": "anot", "phase": "2h", "depth": self.depth, "id": self.agent_id}
+                )
             self._log_llm(f"i{i}", prompt, resp)
 
             if not resp.strip():
@@ -660,7 +813,7 @@ class ReActAgent:
             if self.skipped or done:
                 break
 
-            conv.append(f"\n{resp}\nObs: {obs}\n")
+            prompt += f"\n\n{resp}\nObs: {obs}\n"
 
         return not self.skipped
 
@@ -700,4 +853,4 @@ async def run_hierarchical_phase2(
     main_agent = ReActAgent("main", 0, context, items)
     await main_agent.run()
 
-    return await shared.get_steps()
+    return shared.get_steps()
@@ -3,7 +3,47 @@
 
 import json
 import re
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+    ahocorasick = None
+
+# Leading "(id)" of a step, used to list the step IDs present
+STEP_ID_PATTERN = re.compile(r'\((\w+)\)')
+# Separators in read() paths like items[2].reviews[0].text
+PATH_SPLIT_PATTERN = re.compile(r'[.\[\]]')
+
+
+def _escape_quotes(prompt: str) -> str:
+    """Escape single quotes for an LLM('...') step; the `in` check skips the slower replace scan."""
+    return prompt.replace("'", "\\'") if "'" in prompt else prompt
+
+
+def _locate_step(step_id: str, lwt_steps: List[str]) -> Tuple[int, int]:
+    """Find step_id's step and the first (final) step in one pass.
+
+    Returns (step index, final index), -1 where absent. Stops at step_id's
+    step, so the final index is only complete when step_id is absent.
+    """
+    head = f"({step_id})="
+    final_idx = -1
+    for i, step in enumerate(lwt_steps):
+        if step.startswith(head):
+            return i, final_idx
+        if final_idx < 0 and '(final)=' in step:
+            final_idx = i
+    return -1, final_idx
+
+
+@lru_cache(maxsize=1024)
+def _parse_path(path: str) -> Tuple[str, ...]:
+    """Split a path like items[2].reviews[0].text into its parts."""
+    return tuple(x for x in PATH_SPLIT_PATTERN.split(path) if x)
 
 
 def tool_read(path: str, data: dict) -> str:
@@ -11,9 +51,7 @@ def tool_read(path: str, data: dict) -> str:
     def resolve_path(p: str, d):
         if not p:
             return d
-        # Parse path like items[2].reviews[0].text
-        parts = re.split(r'\.|\[|\]', p)
-        parts = [x for x in parts if x]
+        parts = _parse_path(p)
         val = d
         for part in parts:
             try:
@@ -39,10 +77,7 @@ def tool_lwt_list(lwt_steps: List[str]) -> str:
     """Show current LWT steps with indices."""
     if not lwt_steps:
         return "(empty)"
-    lines = []
-    for i, step in enumerate(lwt_steps):
-        lines.append(f"{i}: {step}")
-    return "\n".join(lines)
+    return "\n".join(f"{i}: {step}" for i, step in enumerate(lwt_steps))
 
 
 def tool_lwt_get(idx: int, lwt_steps: List[str]) -> str:
@@ -64,7 +99,7 @@ def tool_lwt_set_prompt(idx: int, step_id: str, prompt: str, lwt_steps: List[str
     """Replace step at index with auto-formatted LLM call."""
     if idx < 0 or idx >= len(lwt_steps):
         return f"Error: index {idx} out of range (0-{len(lwt_steps)-1})"
-    escaped_prompt = prompt.replace("'", "\\'")
+    escaped_prompt = _escape_quotes(prompt)
     formatted_step = f"({step_id})=LLM('{escaped_prompt}')"
     lwt_steps[idx] = formatted_step
     return f"OK"
@@ -83,14 +118,14 @@ def tool_update_step(step_id: str, prompt: str, lwt_steps: List[str]) -> str:
         "OK" on success, error message if step_id not found
     """
     # Find step with matching ID
-    pattern = re.compile(rf'^\({re.escape(step_id)}\)=')
+    head = f"({step_id})="
     for i, step in enumerate(lwt_steps):
-        if pattern.match(step):
-            escaped_prompt = prompt.replace("'", "\\'")
+        if step.startswith(head):
+            escaped_prompt = _escape_quotes(prompt)
             lwt_steps[i] = f"({step_id})=LLM('{escaped_prompt}')"
             return "OK"
 
-    available = [re.match(r'\((\w+)\)', s).group(1) for s in lwt_steps if re.match(r'\((\w+)\)', s)]
+    available = [m.group(1) for m in map(STEP_ID_PATTERN.match, lwt_steps) if m]
     return f"Error: step '{step_id}' not found. Available: {available}"
 
 
@@ -106,23 +141,19 @@ def tool_insert_step(step_id: str, prompt: str, lwt_steps: List[str]) -> str:
     Returns:
         "OK" on success, error if step_id already exists
     """
-    # Check if step ID already exists
-    pattern = re.compile(rf'^\({re.escape(step_id)}\)=')
-    for step in lwt_steps:
-        if pattern.match(step):
-            return f"Step '{step_id}' already exists. Use update_step to modify."
+    # Check if step ID already exists, noting where (final) is
+    existing_idx, final_idx = _locate_step(step_id, lwt_steps)
+    if existing_idx >= 0:
+        return f"Step '{step_id}' already exists. Use update_step to modify."
 
-    escaped_prompt = prompt.replace("'", "\\'")
+    escaped_prompt = _escape_quotes(prompt)
     new_step = f"({step_id})=LLM('{escaped_prompt}')"
 
-    # Insert before (final) step
-    for i, step in enumerate(lwt_steps):
-        if '(final)=' in step:
-            lwt_steps.insert(i, new_step)
-            return "OK"
-
-    # No (final) found, append
-    lwt_steps.append(new_step)
+    # Insert before (final) step; no (final) found, append
+    if final_idx >= 0:
+        lwt_steps.insert(final_idx, new_step)
+    else:
+        lwt_steps.append(new_step)
     return "OK"
 
 
@@ -158,7 +189,7 @@ def tool_lwt_insert_prompt(idx: int, step_id: str, prompt: str, lwt_steps: List[
         return f"Error: index {idx} cannot be negative"
 
     # Escape any single quotes in the prompt
-    escaped_prompt = prompt.replace("'", "\\'")
+    escaped_prompt = _escape_quotes(prompt)
     # Build properly formatted step
     formatted_step = f"({step_id})=LLM('{escaped_prompt}')"
 
@@ -171,11 +202,7 @@ def tool_lwt_insert_prompt(idx: int, step_id: str, prompt: str, lwt_steps: List[
 
 def tool_review_length(item_num: int, data: dict) -> str:
     """Return total character count of reviews for item."""
-    items = data.get('items', data)
-    item = items.get(str(item_num), {})
-    reviews = item.get('reviews', [])
-    total = sum(len(r.get('text', '')) for r in reviews if isinstance(r, dict))
-    return str(total)
+    return str(sum(_review_lengths(_get_item(item_num, data))))
 
 
 def tool_get_review_lengths(item_num: int, data: dict) -> str:
@@ -183,11 +210,7 @@ def tool_get_review_lengths(item_num: int, data: dict) -> str:
 
     Returns JSON array of lengths, e.g., [1200, 5400, 800]
     """
-    items = data.get('items', data)
-    item = items.get(str(item_num), {})
-    reviews = item.get('reviews', [])
-    lengths = [len(r.get('text', '')) for r in reviews if isinstance(r, dict)]
-    return json.dumps(lengths)
+    return json.dumps(_review_lengths(_get_item(item_num, data)))
 
 
 def tool_keyword_search(item_num: int, keyword: str, data: dict) -> str:
@@ -203,8 +226,7 @@ def tool_keyword_search(item_num: int, keyword: str, data: dict) -> str:
         "total_matches": 3
     }
     """
-    items = data.get('items', data)
-    item = items.get(str(item_num), {})
+    item = _get_item(item_num, data)
     reviews = item.get('reviews', [])
 
     matches = []
@@ -242,6 +264,54 @@ def tool_keyword_search(item_num: int, keyword: str, data: dict) -> str:
     })
 
 
+def tool_keyword_search_batch(item_num: int, keywords: List[str], data: dict) -> Dict[str, str]:
+    """Search for several keywords in item's reviews, scanning each review once.
+
+    Returns keyword -> the JSON tool_keyword_search gives for that keyword.
+    With pyahocorasick all keywords share one automaton (overlapping hits
+    included, as in the find loop); otherwise each keyword is searched alone.
+    """
+    unique = list(dict.fromkeys(keywords))
+    if len(unique) < 2 or not HAS_AHOCORASICK:
+        return {kw: tool_keyword_search(item_num, kw, data) for kw in unique}
+
+    needles = {kw: kw.lower() for kw in unique}
+    automaton = ahocorasick.Automaton()
+    for needle in needles.values():
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+
+    reviews = _get_item(item_num, data).get('reviews', [])
+    results = {needle: ([], [], [0]) for needle in needles.values()}  # matches, no_match, [total]
+
+    for i, review in enumerate(reviews):
+        if not isinstance(review, dict):
+            continue
+        text = review.get('text', '')
+        length = len(text)
+
+        positions = {}
+        for end, needle in automaton.iter(text.lower()):
+            positions.setdefault(needle, []).append(end - len(needle) + 1)
+
+        for needle, (matches, no_match, total) in results.items():
+            hits = positions.get(needle)
+            if hits:
+                matches.append({"review": i, "positions": hits, "length": length})
+                total[0] += len(hits)
+            else:
+                no_match.append(i)
+
+    return {
+        kw: json.dumps({
+            "matches": results[needle][0],
+            "no_match_reviews": results[needle][1],
+            "total_matches": results[needle][2][0]
+        })
+        for kw, needle in needles.items()
+    }
+
+
 def tool_get_review_snippet(item_num: int, review_idx: int, start: int, length: int, data: dict) -> str:
     """Get a snippet of review text for inspection.
 
@@ -254,8 +324,7 @@ def tool_get_review_snippet(item_num: int, review_idx: int, start: int, length:
     Returns:
         Text snippet or error message
     """
-    items = data.get('items', data)
-    item = items.get(str(item_num), {})
+    item = _get_item(item_num, data)
     reviews = item.get('reviews', [])
 
     if review_idx < 0 or review_idx >= len(reviews):
@@ -288,36 +357,17 @@ def tool_list_items(data: dict, resolved_conditions: list) -> str:
     """
     items = data.get('items', data)
 
-    # Extract field paths from conditions
-    field_paths = set()
-    def extract_paths(cond):
-        if cond.get('type') == 'OR':
-            for opt in cond.get('options', []):
-                extract_paths(opt)
-        elif cond.get('type') == 'AND':
-            for sub in cond.get('conditions', []):
-                extract_paths(sub)
-        else:
-            path = cond.get('path', '')
-            if path:
-                field_paths.add(path)
-
-    for cond in resolved_conditions:
-        extract_paths(cond)
+    # Field paths from conditions, split once; shown by their last part
+    field_paths = [(path_parts[-1], path_parts) for _, path_parts in _condition_paths(resolved_conditions)]
 
     # Build output
     lines = []
-    for key in sorted(items.keys(), key=lambda x: int(x)):
+    for key in sorted(items, key=int):
         item = items[key]
-        attrs = item.get('attributes', {})
-        categories = item.get('categories', [])
 
         parts = [f"Item {key}:"]
-        for path in sorted(field_paths):
-            # Parse path and get value
-            val = _get_nested_value(item, path)
-            # Simplify path for display
-            short_path = path.split('.')[-1] if '.' in path else path
+        for short_path, path_parts in field_paths:
+            val = _get_nested_value_parts(item, path_parts)
             parts.append(f"{short_path}={_format_val(val)}")
 
         lines.append(" ".join(parts))
@@ -336,39 +386,23 @@ def tool_check_item(item_num: int, data: dict, resolved_conditions: list) -> str
     Returns:
         Detailed view of item's relevant attributes
     """
-    items = data.get('items', data)
-    item = items.get(str(item_num), {})
+    item = _get_item(item_num, data)
 
     if not item:
         return f"Error: Item {item_num} not found"
 
-    # Extract field paths
-    field_paths = set()
-    def extract_paths(cond):
-        if cond.get('type') == 'OR':
-            for opt in cond.get('options', []):
-                extract_paths(opt)
-        elif cond.get('type') == 'AND':
-            for sub in cond.get('conditions', []):
-                extract_paths(sub)
-        else:
-            path = cond.get('path', '')
-            if path:
-                field_paths.add(path)
-
-    for cond in resolved_conditions:
-        extract_paths(cond)
+    field_paths = _condition_paths(resolved_conditions)
 
     # Build detailed output
     lines = [f"Item {item_num}:"]
     lines.append(f"  name: {item.get('name', 'Unknown')}")
 
-    for path in sorted(field_paths):
-        val = _get_nested_value(item, path)
+    for path, path_parts in field_paths:
+        val = _get_nested_value_parts(item, path_parts)
         lines.append(f"  {path}: {_format_val(val)}")
 
     # Add categories if relevant
-    if any('categories' in p for p in field_paths):
+    if any('categories' in p for p, _ in field_paths):
         lines.append(f"  categories: {item.get('categories', [])}")
 
     return "\n".join(lines)
@@ -400,33 +434,57 @@ def tool_add_step(step_id: str, prompt: str, lwt_steps: list) -> str:
     Returns:
         Confirmation message
     """
-    # Check if step already exists
-    pattern = re.compile(rf'^\({re.escape(step_id)}\)=')
-    for step in lwt_steps:
-        if pattern.match(step):
-            return f"Error: Step '{step_id}' already exists. Use update_step to modify."
+    # Check if step already exists, noting where (final) is
+    existing_idx, final_idx = _locate_step(step_id, lwt_steps)
+    if existing_idx >= 0:
+        return f"Error: Step '{step_id}' already exists. Use update_step to modify."
 
     # Escape quotes and build step
-    escaped_prompt = prompt.replace("'", "\\'")
+    escaped_prompt = _escape_quotes(prompt)
     new_step = f"({step_id})=LLM('{escaped_prompt}')"
 
-    # If adding 'final', append at end
-    if step_id == 'final':
-        lwt_steps.append(new_step)
+    # If adding 'final', append at end; otherwise insert before 'final'
+    # if it exists, else append
+    if step_id != 'final' and final_idx >= 0:
+        lwt_steps.insert(final_idx, new_step)
     else:
-        # Insert before 'final' if it exists, otherwise append
-        for i, step in enumerate(lwt_steps):
-            if '(final)=' in step:
-                lwt_steps.insert(i, new_step)
-                return f"Step {step_id} added"
         lwt_steps.append(new_step)
 
     return f"Step {step_id} added"
 
 
-def _get_nested_value(item: dict, path: str):
-    """Get value from nested dict using dot notation path."""
-    parts = path.split('.')
+def _get_item(item_num: int, data: dict) -> dict:
+    """Item by number from the full data dict (or a bare items dict); {} if missing."""
+    return data.get('items', data).get(str(item_num), {})
+
+
+def _review_lengths(item: dict) -> List[int]:
+    """Character count of each review in an item."""
+    return [len(r.get('text', '')) for r in item.get('reviews', []) if isinstance(r, dict)]
+
+
+def _condition_paths(resolved_conditions: list) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Sorted field paths used by the conditions (through OR/AND), with their dot-split parts."""
+    field_paths = set()
+    def extract_paths(cond):
+        if cond.get('type') == 'OR':
+            for opt in cond.get('options', []):
+                extract_paths(opt)
+        elif cond.get('type') == 'AND':
+            for sub in cond.get('conditions', []):
+                extract_paths(sub)
+        else:
+            path = cond.get('path', '')
+            if path:
+                field_paths.add(path)
+
+    for cond in resolved_conditions:
+        extract_paths(cond)
+    return [(path, tuple(path.split('.'))) for path in sorted(field_paths)]
+
+
+def _get_nested_value_parts(item: dict, parts: Tuple[str, ...]):
+    """Get value from nested dict using a dot notation path, pre-split into parts."""
     current = item
     for part in parts:
         if isinstance(current, dict):
@@ -449,8 +507,6 @@ def _format_val(val) -> str:
     if isinstance(val, dict):
         # For nested dicts like Ambience, show only True values
         true_keys = [k for k, v in val.items() if v is True]
-        false_count = sum(1 for v in val.values() if v is False)
-        none_count = sum(1 for v in val.values() if v is None)
         if true_keys:
             return "{" + ",".join(f"{k}:True" for k in true_keys) + "}"
         return f"{{all False/None}}"
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Unit tests for G1a ground-truth verdicts and the flat-array cache."""
+
+import numpy as np
+import pytest
+
+from explore.scoring import ground_truth
+from explore.scoring.ground_truth import (
+    L1_TOTAL_WEIGHT, _build_flat_soa, _gt_v1_from_layer1, _load_flat_soa_cache,
+    _save_flat_soa_cache, _soa_schema_hash, verdict_distribution,
+)
+
+
+# =============================================================================
+# VERDICT_DISTRIBUTION TESTS
+# =============================================================================
+
+class TestVerdictDistribution:
+    """The summary must agree with the per-record verdict labels."""
+
+    @staticmethod
+    def _gt_with_raw_score(raw_score):
+        """V1 GT with no reviews, so raw_risk = 2.5 + cuisine_modifier * 0.5."""
+        l1 = np.zeros(L1_TOTAL_WEIGHT + 1)
+        return _gt_v1_from_layer1(l1, (raw_score - 2.5) * 2)
+
+    @pytest.mark.parametrize("raw_score,verdict", [
+        (3.996, "Low Risk"),
+        (4.0, "High Risk"),
+        (7.996, "High Risk"),
+        (8.0, "Critical Risk"),
+    ])
+    def test_threshold_edges(self, raw_score, verdict):
+        gt = self._gt_with_raw_score(raw_score)
+        assert gt.verdict == verdict
+        assert verdict_distribution([gt.verdict])[verdict] == 1
+
+    def test_rounded_score_does_not_change_bin(self):
+        # 7.996 is stored as 8.0 but its verdict is still "High Risk"
+        all_gt = [self._gt_with_raw_score(s) for s in (3.996, 4.0, 7.996, 8.0)]
+        assert all_gt[2].final_risk_score == 8.0
+        assert verdict_distribution(gt.verdict for gt in all_gt) == {
+            "Low Risk": 1, "High Risk": 2, "Critical Risk": 1,
+        }
+
+
+# =============================================================================
+# FLAT SOA CACHE TESTS
+# =============================================================================
+
+class TestFlatSoaCache:
+    """The .npz cache must never serve stale or partial data."""
+
+    @pytest.fixture
+    def cache_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "judgments_soa.npz"
+        monkeypatch.setattr(ground_truth, "SOA_CACHE_FILE", path)
+        return path
+
+    @pytest.fixture
+    def flat(self):
+        judgments = {
+            "Cafe A": {
+                "restaurant_meta": {"categories": "Thai"},
+                "reviews": [
+                    {"idx": 0, "incident_severity": "mild", "account_type": "firsthand",
+                     "safety_interaction": "none", "stars": 2, "useful": 1, "_year": 2023},
+                ],
+            },
+        }
+        return _build_flat_soa(judgments)
+
+    @staticmethod
+    def _key(schema_hash=None):
+        if schema_hash is None:
+            schema_hash = _soa_schema_hash()
+        return np.array([1, 2, schema_hash], dtype=np.int64)
+
+    def test_round_trip(self, cache_file, flat):
+        _save_flat_soa_cache(flat, self._key())
+        loaded = _load_flat_soa_cache(self._key())
+        assert loaded["names"] == ["Cafe A"]
+        assert np.array_equal(loaded["code"], flat["code"])
+        # Written via a temp file that is renamed into place
+        assert [p.name for p in cache_file.parent.iterdir()] == [cache_file.name]
+
+    def test_version_bump_is_a_miss(self, cache_file, flat, monkeypatch):
+        _save_flat_soa_cache(flat, self._key())
+        monkeypatch.setattr(ground_truth, "SOA_CACHE_VERSION", ground_truth.SOA_CACHE_VERSION + 1)
+        assert _load_flat_soa_cache(self._key()) is None
+
+    def test_constant_change_is_a_miss(self, cache_file, flat, monkeypatch):
+        _save_flat_soa_cache(flat, self._key())
+        monkeypatch.setitem(ground_truth.CUISINE_RISK_BASE, "Thai", 2.5)
+        assert _load_flat_soa_cache(self._key()) is None
+
+    def test_truncated_cache_is_a_miss(self, cache_file, flat):
+        _save_flat_soa_cache(flat, self._key())
+        cache_file.write_bytes(cache_file.read_bytes()[:100])
+        assert _load_flat_soa_cache(self._key()) is None
+
+    def test_empty_cache_is_a_miss(self, cache_file, flat):
+        cache_file.write_bytes(b"")
+        assert _load_flat_soa_cache(self._key()) is None
+
+    def test_missing_cache_is_a_miss(self, cache_file):
+        assert _load_flat_soa_cache(self._key()) is None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Unit tests for KNoT script execution and variable substitution.
+
+The LLM is replaced by a deterministic function of the prompt, so these
+run without any API access.
+"""
+
+import ast
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import utils.llm
+
+# knot_original imports the LLM helpers as top-level `llm` (now utils/llm.py),
+# and the extracted_dag_async package __init__ needs modules outside this tree,
+# so the module is loaded straight from its file.
+sys.modules.setdefault("llm", utils.llm)
+_spec = importlib.util.spec_from_file_location(
+    "knot_original", Path(__file__).parent.parent / "extracted_dag_async" / "knot_original.py")
+knot = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(knot)
+
+
+# =============================================================================
+# EXECUTE_SCRIPT TESTS
+# =============================================================================
+
+SCRIPT = """(0)=LLM("list the dishes")
+(1)=LLM("describe {(0)}[0]")
+(2)=LLM("describe {(0)}[1]")
+(3)=LLM("compare {(1)} with {(2)}")
+(4)=LLM("rate {(input)}")"""
+
+
+class FakeLLM:
+    """Deterministic call_llm replacement that records peak concurrency."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def __call__(self, prompt, system="", role="default"):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        if prompt == "list the dishes":
+            return '["pad thai", "satay"]'
+        return f"<{prompt}>"
+
+
+def execute_sequentially(script, query, context, call_llm):
+    """The original execute_script: every step in script order."""
+    cache = {}
+    final = ""
+    for idx, instr in knot.parse_script(script):
+        output = call_llm(knot.substitute_variables(instr, query, context, cache))
+        try:
+            cache[idx] = ast.literal_eval(output)
+        except (ValueError, SyntaxError):
+            cache[idx] = output
+        final = output
+    return final, cache
+
+
+class TestExecuteScript:
+    """execute_script runs layers concurrently but must match sequential order."""
+
+    @pytest.fixture
+    def fake_llm(self, monkeypatch):
+        fake = FakeLLM()
+        monkeypatch.setattr(knot, "call_llm", fake)
+        return fake
+
+    def test_matches_sequential_execution(self, fake_llm):
+        expected_final, expected_cache = execute_sequentially(SCRIPT, "Thai Cafe", "peanut allergy", fake_llm)
+
+        method = knot.KnowledgeNetworkOfThought()
+        final = method.execute_script(SCRIPT, "Thai Cafe", "peanut allergy")
+
+        assert method.cache == expected_cache
+        # (4) is independent and runs in the first layer, but is still the answer
+        assert final == expected_final == "<rate Thai Cafe>"
+
+    def test_independent_steps_run_concurrently(self, fake_llm):
+        knot.KnowledgeNetworkOfThought().execute_script(SCRIPT, "Thai Cafe", "peanut allergy")
+        assert fake_llm.peak >= 2
+
+    def test_layers_follow_dependencies(self):
+        layers = knot.build_execution_layers(knot.parse_script(SCRIPT))
+        assert [[idx for idx, _ in layer] for layer in layers] == [["0", "4"], ["1", "2"], ["3"]]
+
+
+# =============================================================================
+# PARSE_ACCESSORS / SUBSTITUTE_VARIABLES TESTS
+# =============================================================================
+
+class TestParseAccessors:
+    """Accessor chains are parsed once into (key, int index or None) pairs."""
+
+    def test_mixed_chain(self):
+        assert knot.parse_accessors("[item_data][0][review]") == (
+            ("item_data", None), ("0", 0), ("review", None))
+
+    def test_empty(self):
+        assert knot.parse_accessors("") == ()
+
+    def test_non_decimal_digit_key(self):
+        # "²".isdigit() but int("²") raises; such a chain resolves to ''
+        assert knot.parse_accessors("[²]") is None
+        assert knot.parse_accessors("[reviews][²][text]") is None
+
+
+class TestSubstituteAccessors:
+    """Expected values are those of the per-call accessor parsing it replaced."""
+
+    @pytest.fixture
+    def cache(self):
+        return {
+            "0": {"²": "sq", "2": "two", "name": "Cafe"},
+            "1": '["a", "b", "c"]',
+            "2": {"reviews": [{"text": "hi"}]},
+            "3": "plain",
+        }
+
+    @pytest.mark.parametrize("template,expected", [
+        ("{(0)}[²]", ""),
+        ("{(0)}[2]", "two"),
+        ("{(0)}[name]", "Cafe"),
+        ("{(1)}[1]", "b"),
+        ("{(1)}[5]", ""),
+        ("{(1)}[-1]", ""),
+        ("{(2)}[reviews][0][text]", "hi"),
+        ("{(2)}[reviews][²][text]", ""),
+        ("{(3)}[0]", ""),
+        ("{(input)}[k]", "[1]"),
+        ("x {(1)}[0] y {(0)}[name]", "x a y Cafe"),
+    ])
+    def test_substitution(self, cache, template, expected):
+        assert knot.substitute_variables(template, {"k": [1]}, "ctx", cache) == expected
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Unit tests for tool-call parsing and review agents in hierarchical Phase 2.
+
+parse_emit replaced a DOTALL regex; these pin it (and the single-pass
+scan_tool_calls built on it) to that regex's matches. The agent tests
+stub call_llm_async, so they run without any API access.
+"""
+
+import asyncio
+import importlib.util
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+# The extracted_dag_async package __init__ needs modules outside this tree,
+# so the module is loaded straight from its file.
+_spec = importlib.util.spec_from_file_location(
+    "phase2_hierarchical",
+    Path(__file__).parent.parent / "extracted_dag_async" / "phase2_hierarchical.py")
+phase2 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(phase2)
+
+# The emit pattern parse_emit replaced
+EMIT_PATTERN = re.compile(r'emit\("([^"]+)",\s*"((?:[^"\\]|\\.)*)"\)', re.DOTALL)
+
+RESPONSES = [
+    'emit("3", "hello")',
+    'emit("3",\n   "multi\nline body")',
+    'emit("", "empty id")',
+    'emit("3" , "space before comma")',
+    # Escaped quotes and backslash runs
+    r'emit("3", "say \"hi\" twice")',
+    r'emit("3", "ends in an escaped backslash \\")',
+    r'emit("3", "two backslashes then an escaped quote \\\" ok")',
+    r'emit("3", "five backslashes before a quote \\\\\" then" )',
+    r'emit("3", "\\\\")',
+    # Unterminated bodies
+    'emit("3", "never closed',
+    'emit("3", "closed without paren" more',
+    'emit("3", "x) emit("4", "y")',
+    r'emit("3", "dangling escape \"',
+    # Calls nested inside emit bodies
+    r'emit("3", "see emit(\"4\", \"inner\") ok")',
+    'emit("3", "x emit("4", "y") z")',
+    'emit("3", "spawn(4) and skip(\\"r\\")") spawn(5)',
+    'Thought: done.\nemit("1", "{\\"ok\\": true}")\nemit("2", "second")',
+]
+
+
+def regex_emits(text):
+    return [m.groups() for m in EMIT_PATTERN.finditer(text)]
+
+
+class TestParseEmit:
+    """parse_emit accepts exactly what EMIT_PATTERN.match would."""
+
+    @pytest.mark.parametrize("text", RESPONSES)
+    def test_every_offset(self, text):
+        for pos in range(len(text)):
+            m = EMIT_PATTERN.match(text, pos)
+            expected = (m.end(), m.groups()) if m else None
+            assert phase2.parse_emit(text, pos) == expected
+
+    @pytest.mark.parametrize("depth", [0, 1, 2])
+    @pytest.mark.parametrize("text", RESPONSES)
+    def test_scan_matches_finditer(self, text, depth):
+        calls = phase2.scan_tool_calls(text, phase2.DEPTH_TOOL_PARSERS[depth])
+        assert calls["emit"] == regex_emits(text)
+
+    def test_calls_inside_emit_body_still_count_for_other_verbs(self):
+        text = 'emit("3", "spawn(4) and skip(\\"r\\")") spawn(5)'
+        calls = phase2.scan_tool_calls(text, phase2.DEPTH_TOOL_PARSERS[1])
+        assert calls["spawn"] == [("4",), ("5",)]
+        assert calls["emit"] == [("3", 'spawn(4) and skip(\\"r\\")')]
+
+    def test_fuzzed_responses(self):
+        rng = random.Random(0)
+        pieces = ['emit("', 'emit("1", "', '"', '\\', '\\"', ',', ' ', '\n', ')', 'a', '7', 'spawn(2)']
+        for _ in range(2000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 30)))
+            for depth in (0, 1, 2):
+                calls = phase2.scan_tool_calls(text, phase2.DEPTH_TOOL_PARSERS[depth])
+                assert calls["emit"] == regex_emits(text), text
+
+
+# =============================================================================
+# REVIEW AGENT SHORT-CIRCUIT TESTS
+# =============================================================================
+
+SOCIAL_ONLY = [{"original_type": "SOCIAL", "description": "reviewed by a friend"}]
+META_ONLY = [{"original_type": "REVIEW", "path": "reviews", "description": "reviews since 2020"}]
+ITEM = {"reviews": [{"text": "Great coffee with friends", "user_id": "u1", "date": "2021-05-01"}]}
+
+
+class StubLLM:
+    """call_llm_async stand-in: item agents spawn review 0, review agents match."""
+
+    def __init__(self):
+        self.prompts = {1: [], 2: []}
+
+    async def __call__(self, prompt, system="", role="default", context=None):
+        depth = context["depth"]
+        self.prompts[depth].append(prompt)
+        if depth == 2:
+            return 'Action: emit("match", "friend review")\nAction: done()'
+        if len(self.prompts[1]) == 1:
+            return "Action: spawn(0)\nAction: wait_all()"
+        return "Action: done()"
+
+
+def run_item_agent(conditions, monkeypatch):
+    stub = StubLLM()
+    monkeypatch.setattr(phase2, "call_llm_async", stub)
+
+    async def run():
+        context = phase2.AgentContext(
+            lwt_seed="", conditions=conditions, logical_structure="", items={"1": ITEM},
+            request_id="R01", shared_state=phase2.SharedState(), friends_1hop={"u1"})
+        return await phase2.ReActAgent("1", 1, context, ITEM).run()
+
+    asyncio.run(run())
+    return stub
+
+
+class TestReviewAgentShortCircuit:
+    """Review agents skip without an LLM call only when they have nothing to look for."""
+
+    def test_social_only_review_agents_still_run(self, monkeypatch):
+        stub = run_item_agent(SOCIAL_ONLY, monkeypatch)
+        assert len(stub.prompts[2]) == 1
+        assert "wait_all: 1 matched, 0 skipped" in stub.prompts[1][1]
+
+    def test_meta_only_review_agents_skip_without_llm(self, monkeypatch):
+        stub = run_item_agent(META_ONLY, monkeypatch)
+        assert stub.prompts[2] == []
+        assert "wait_all: 0 matched, 1 skipped" in stub.prompts[1][1]
@@ -203,6 +203,10 @@ class LLMService:
                 else:
                     self._config[k] = str(v) if k != "base_url" else str(v).strip()
 
+    def get_config(self) -> dict:
+        """Copy of the current configuration."""
+        return dict(self._config)
+
     def get_model(self, role: str = "default") -> str:
         if self._config["model"]:
             return self._config["model"]
@@ -515,6 +519,9 @@ def get_model(role: str = "default") -> str:
 def get_configured_model() -> str:
     return _service.get_model()
 
+def get_config() -> dict:
+    return _service.get_config()
+
 def call_llm(prompt: str, system: str = "", provider: str = None, 
              model: str = None, role: str = "default", context: dict = None) -> str:
     return _service.call_sync(prompt, system, provider, model, role, context)